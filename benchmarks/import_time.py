@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Measure the cold start import time of container-transform for each
+input/output pair with ``python -X importtime``.
+
+Each pair is measured in a fresh interpreter that imports the CLI and runs a
+conversion of a synthetic input from ``benchmarks/synthetic.py``, so only the
+transformer modules that pair needs are imported. The report is written as
+JSON, and the script exits non-zero if any pair fails to convert, as it
+wouldn't import everything it needs, or takes longer than ``--max-ms`` to
+import.
+
+Usage::
+
+    $ python benchmarks/import_time.py --repeat 5 --output import_time.json
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+
+from synthetic import GENERATORS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OUTPUT_TYPES = ['ecs', 'compose', 'systemd', 'marathon', 'chronos', 'kubernetes']
+WATCHED_MODULES = ['yaml', 'jinja2', 'click']
+
+SCRIPT = '''
+import sys
+from container_transform.client import transform
+from container_transform.converter import Converter
+Converter({filename!r}, {input_type!r}, {output_type!r}).convert()
+'''
+
+
+def write_inputs(directory, services=3):
+    """
+    :returns: The filename of a synthetic input for each input type
+    :rtype: dict
+    """
+    filenames = {}
+    for input_type, generate in GENERATORS.items():
+        filenames[input_type] = os.path.join(directory, input_type)
+        with open(filenames[input_type], 'w') as stream:
+            stream.write(generate(services))
+    return filenames
+
+
+def measure(filename, input_type, output_type):
+    """
+    :returns: The cumulative import time in microseconds, the top level
+        modules imported and whether the conversion succeeded
+    :rtype: tuple of (int, set of str, bool)
+    """
+    script = SCRIPT.format(
+        filename=filename, input_type=input_type, output_type=output_type)
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    total, modules = 0, set()
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Only count top level imports, nested ones are in their cumulative time
+        if not name[1:].startswith(' '):
+            total += int(cumulative)
+        modules.add(name.strip().split('.')[0])
+    return total, modules, process.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help='Write the JSON report here')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Fail if any pair takes longer than this to import')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        filenames = write_inputs(directory)
+        report = []
+        for input_type in sorted(filenames):
+            for output_type in OUTPUT_TYPES:
+                timings, modules = [], set()
+                for _ in range(args.repeat):
+                    total, modules, ok = measure(filenames[input_type], input_type, output_type)
+                    timings.append(total)
+                report.append({
+                    'input_type': input_type,
+                    'output_type': output_type,
+                    'import_ms': round(median(timings) / 1000.0, 2),
+                    'modules': sorted(m for m in WATCHED_MODULES if m in modules),
+                    'converted': ok,
+                })
+                line = '{input_type:>10} -> {output_type:<10} {import_ms:8.2f}ms {modules}'
+                print(line.format(**report[-1]) + ('' if ok else ' (conversion failed)'))
+    finally:
+        shutil.rmtree(directory)
+
+    if args.output:
+        with open(args.output, 'w') as stream:
+            json.dump({'python': sys.version, 'results': report}, stream, indent=4)
+
+    failed = [result for result in report if not result['converted']]
+    if failed:
+        print('{} pairs failed to convert'.format(len(failed)))
+        return 1
+
+    slowest = max(result['import_ms'] for result in report)
+    if args.max_ms is not None and slowest > args.max_ms:
+        print('Slowest import took {}ms, more than {}ms'.format(slowest, args.max_ms))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Compare reading and writing JSON with each installed JSON backend.
+
+The synthetic JSON inputs from ``benchmarks/synthetic.py`` are read with
+``loads()`` and written with ``dumps(indent=4, sort_keys=True)``, as the
+converter does, at each size given with ``--sizes``. Times are the best of
+``--repeat`` runs, and each backend is reported as a multiple of the speed of
+the standard library.
+
+Usage::
+
+    $ python benchmarks/json_backend.py --sizes 10,100,1000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from container_transform.serialization import JSON_BACKENDS  # noqa: E402
+
+from synthetic import GENERATORS  # noqa: E402
+
+JSON_INPUT_TYPES = ('ecs', 'marathon', 'chronos')
+
+
+def best_of(func, repeat):
+    """
+    :returns: The best wall time in seconds
+    :rtype: float
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def backends():
+    for name, cls in sorted(JSON_BACKENDS.items()):
+        try:
+            yield name, cls()
+        except ImportError:
+            print('{} is not installed'.format(name))
+
+
+def benchmark(sizes, input_types, repeat):
+    installed = list(backends())
+    for size in sizes:
+        for input_type in input_types:
+            data = GENERATORS[input_type](size)
+            document = json.loads(data)
+            for name, backend in installed:
+                yield {
+                    'input_type': input_type,
+                    'services': size,
+                    'backend': name,
+                    'loads': best_of(lambda: backend.loads(data), repeat),
+                    'dumps': best_of(lambda: backend.dumps(document, 4, True), repeat),
+                }
+
+
+def format_result(result, stdlib):
+    line = '{input_type:>10} {services:>6} {backend:<8}'.format(**result)
+    for operation in ('loads', 'dumps'):
+        line += ' {} {:>9.3f}ms {:>5.2f}x'.format(
+            operation, result[operation] * 1000, stdlib[operation] / result[operation])
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='10,100,1000',
+                        help='Comma separated numbers of services')
+    parser.add_argument('--input-types', default=','.join(JSON_INPUT_TYPES))
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    stdlib = None
+    for result in benchmark(sizes, args.input_types.split(','), args.repeat):
+        if result['backend'] == 'json':
+            stdlib = result
+        print(format_result(result, stdlib))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
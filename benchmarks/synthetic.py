@@ -0,0 +1,196 @@
+"""
+Generate synthetic inputs with ``n`` services for each input format.
+
+Every service gets an image, a command, cpu and memory limits, two port
+mappings, two bind mounts, ``env`` environment variables and a logging
+driver with options, so every transformer has real work to do.
+"""
+import json
+
+import yaml
+
+
+def _service(idx, env):
+    return {
+        'name': 'svc{}'.format(idx),
+        'image': 'registry.example.com/team/app{}:1.{}'.format(idx, idx % 10),
+        'command': ['/usr/bin/app', '--worker', str(idx), '--log-level', 'info'],
+        'cpu': 128 + idx % 4 * 128,
+        'memory_mb': 256 + idx % 4 * 256,
+        'ports': [(8000 + idx % 1000, 80, 'tcp'), (9000 + idx % 1000, 53, 'udp')],
+        'volumes': [
+            ('/srv/svc{}/data'.format(idx), '/var/lib/app', False),
+            ('/etc/svc{}'.format(idx), '/etc/app', True),
+        ],
+        'environment': dict(
+            ('VAR_{}'.format(e), 'value-{}-{}'.format(idx, e)) for e in range(env)),
+        'logging': {
+            'driver': 'syslog',
+            'options': {'tag': 'svc{}'.format(idx), 'syslog-facility': 'daemon'},
+        },
+    }
+
+
+def generate_compose(services, env=10):
+    output = {}
+    for idx in range(services):
+        s = _service(idx, env)
+        output[s['name']] = {
+            'image': s['image'],
+            'command': s['command'],
+            'cpu_shares': s['cpu'],
+            'mem_limit': '{}m'.format(s['memory_mb']),
+            'ports': [
+                '{}:{}{}'.format(host, container, '/udp' if proto == 'udp' else '')
+                for host, container, proto in s['ports']],
+            'volumes': [
+                '{}:{}{}'.format(host, container, ':ro' if ro else '')
+                for host, container, ro in s['volumes']],
+            'environment': s['environment'],
+            'logging': s['logging'],
+        }
+    return yaml.safe_dump({'version': '2', 'services': output}, default_flow_style=False)
+
+
+def generate_ecs(services, env=10):
+    containers, volumes = [], []
+    for idx in range(services):
+        s = _service(idx, env)
+        mount_points = []
+        for vol_idx, (host, container, ro) in enumerate(s['volumes']):
+            name = '{}-vol{}'.format(s['name'], vol_idx)
+            volumes.append({'name': name, 'host': {'sourcePath': host}})
+            mount_points.append({'sourceVolume': name, 'containerPath': container, 'readOnly': ro})
+        containers.append({
+            'name': s['name'],
+            'image': s['image'],
+            'command': s['command'],
+            'cpu': s['cpu'],
+            'memory': s['memory_mb'],
+            'essential': True,
+            'portMappings': [
+                {'hostPort': host, 'containerPort': container, 'protocol': proto}
+                for host, container, proto in s['ports']],
+            'mountPoints': mount_points,
+            'environment': [{'name': k, 'value': v} for k, v in s['environment'].items()],
+            'logConfiguration': {
+                'logDriver': s['logging']['driver'],
+                'options': s['logging']['options'],
+            },
+        })
+    return json.dumps({'family': 'bench', 'containerDefinitions': containers, 'volumes': volumes})
+
+
+def _docker_parameters(s):
+    parameters = [{'key': 'log-driver', 'value': s['logging']['driver']}]
+    parameters.extend(
+        {'key': 'log-opt', 'value': '{}={}'.format(k, v)}
+        for k, v in sorted(s['logging']['options'].items()))
+    parameters.append({'key': 'workdir', 'value': '/srv'})
+    return parameters
+
+
+def _mesos_volumes(s):
+    return [
+        {'hostPath': host, 'containerPath': container, 'mode': 'RO' if ro else 'RW'}
+        for host, container, ro in s['volumes']]
+
+
+def generate_marathon(services, env=10):
+    apps = []
+    for idx in range(services):
+        s = _service(idx, env)
+        apps.append({
+            'id': '/bench/{}'.format(s['name']),
+            'args': s['command'],
+            'cpus': s['cpu'] / 1024.0,
+            'mem': s['memory_mb'],
+            'instances': 1,
+            'env': s['environment'],
+            'container': {
+                'type': 'DOCKER',
+                'volumes': _mesos_volumes(s),
+                'docker': {
+                    'image': s['image'],
+                    'network': 'BRIDGE',
+                    'portMappings': [
+                        {'hostPort': host, 'containerPort': container, 'protocol': proto}
+                        for host, container, proto in s['ports']],
+                    'parameters': _docker_parameters(s),
+                },
+            },
+        })
+    return json.dumps({'id': '/bench', 'apps': apps})
+
+
+def generate_chronos(services, env=10):
+    jobs = []
+    for idx in range(services):
+        s = _service(idx, env)
+        parameters = _docker_parameters(s)
+        parameters.extend(
+            {'key': 'publish', 'value': '{}:{}{}'.format(
+                host, container, '/udp' if proto == 'udp' else '')}
+            for host, container, proto in s['ports'])
+        jobs.append({
+            'name': s['name'],
+            'arguments': s['command'],
+            'cpus': s['cpu'] / 1024.0,
+            'mem': s['memory_mb'],
+            'environmentVariables': [
+                {'name': k, 'value': v} for k, v in s['environment'].items()],
+            'container': {
+                'type': 'DOCKER',
+                'image': s['image'],
+                'network': 'BRIDGE',
+                'volumes': _mesos_volumes(s),
+                'parameters': parameters,
+            },
+        })
+    return json.dumps(jobs)
+
+
+def generate_kubernetes(services, env=10):
+    containers, volumes = [], []
+    for idx in range(services):
+        s = _service(idx, env)
+        mounts = []
+        for vol_idx, (host, container, ro) in enumerate(s['volumes']):
+            name = '{}-vol{}'.format(s['name'], vol_idx)
+            volumes.append({'name': name, 'hostPath': {'path': host}})
+            mounts.append({'name': name, 'mountPath': container, 'readOnly': ro})
+        containers.append({
+            'name': s['name'],
+            'image': s['image'],
+            'args': s['command'],
+            'ports': [
+                {'hostPort': host, 'containerPort': container, 'protocol': proto.upper()}
+                for host, container, proto in s['ports']],
+            'env': [{'name': k, 'value': v} for k, v in s['environment'].items()],
+            'volumeMounts': mounts,
+            'resources': {
+                'limits': {'cpu': '{}m'.format(s['cpu']), 'memory': '{}Mi'.format(s['memory_mb'])},
+            },
+        })
+    deployment = {
+        'apiVersion': 'extensions/v1beta1',
+        'kind': 'Deployment',
+        'metadata': {'name': 'bench'},
+        'spec': {
+            'replicas': 1,
+            'template': {
+                'metadata': {'labels': {'app': 'bench'}},
+                'spec': {'containers': containers, 'volumes': volumes},
+            },
+        },
+    }
+    return yaml.safe_dump(deployment, default_flow_style=False)
+
+
+GENERATORS = {
+    'compose': generate_compose,
+    'ecs': generate_ecs,
+    'marathon': generate_marathon,
+    'chronos': generate_chronos,
+    'kubernetes': generate_kubernetes,
+}
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Measure conversion throughput and peak memory for every input/output pair.
+
+Synthetic inputs from ``benchmarks/synthetic.py`` are converted at each size
+given with ``--sizes``. Throughput is reported in containers per second
+using the best of ``--repeat`` runs, and peak memory is measured with
+``tracemalloc`` in a separate run. The report is written as JSON, and can be
+compared against an earlier report with ``--baseline``.
+
+Usage::
+
+    $ python benchmarks/throughput.py --sizes 10,100,1000 --output throughput.json
+    $ python benchmarks/throughput.py --baseline throughput.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from container_transform.converter import Converter  # noqa: E402
+from container_transform.schema import (  # noqa: E402
+    InputTransformationTypes, OutputTransformationTypes)
+from container_transform.version import __version__  # noqa: E402
+
+from synthetic import GENERATORS  # noqa: E402
+
+
+def run(filename, input_type, output_type, repeat):
+    """
+    :returns: The best wall time in seconds and the peak traced memory in
+        bytes
+    :rtype: tuple of (float, int)
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Converter(filename, input_type, output_type).convert()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        Converter(filename, input_type, output_type).convert()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def benchmark(sizes, input_types, output_types, repeat, directory):
+    for size in sizes:
+        for input_type in input_types:
+            filename = os.path.join(directory, '{}-{}'.format(input_type, size))
+            with open(filename, 'w') as stream:
+                stream.write(GENERATORS[input_type](size))
+
+            for output_type in output_types:
+                result = {
+                    'input_type': input_type,
+                    'output_type': output_type,
+                    'services': size,
+                }
+                try:
+                    seconds, peak = run(filename, input_type, output_type, repeat)
+                except Exception as e:
+                    result['error'] = '{}: {}'.format(type(e).__name__, e)
+                else:
+                    result.update({
+                        'seconds': round(seconds, 6),
+                        'containers_per_second': round(size / seconds, 1),
+                        'peak_memory_bytes': peak,
+                    })
+                yield result
+
+
+def _key(result):
+    return result['input_type'], result['output_type'], result['services']
+
+
+def format_result(result, baseline):
+    line = '{input_type:>10} -> {output_type:<10} {services:>6}'.format(**result)
+    if 'error' in result:
+        return '{} {}'.format(line, result['error'])
+
+    line = '{} {:>12.1f}/s {:>9.1f}KiB'.format(
+        line, result['containers_per_second'], result['peak_memory_bytes'] / 1024.0)
+    previous = baseline.get(_key(result))
+    if previous and 'error' not in previous:
+        line += ' {:>6.2f}x speed {:>6.2f}x memory'.format(
+            result['containers_per_second'] / previous['containers_per_second'],
+            result['peak_memory_bytes'] / float(previous['peak_memory_bytes'] or 1))
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='10,100,1000',
+                        help='Comma separated numbers of services')
+    parser.add_argument('--input-types',
+                        default=','.join(t.value for t in InputTransformationTypes))
+    parser.add_argument('--output-types',
+                        default=','.join(t.value for t in OutputTransformationTypes))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help='Write the JSON report here')
+    parser.add_argument('--baseline', default=None, help='A previous JSON report to compare')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as stream:
+            baseline = dict((_key(r), r) for r in json.load(stream)['results'])
+
+    directory = tempfile.mkdtemp()
+    try:
+        sizes = [int(size) for size in args.sizes.split(',')]
+        input_types = args.input_types.split(',')
+        output_types = args.output_types.split(',')
+        results = []
+        for result in benchmark(sizes, input_types, output_types, args.repeat, directory):
+            print(format_result(result, baseline))
+            results.append(result)
+    finally:
+        shutil.rmtree(directory)
+
+    if args.output:
+        with open(args.output, 'w') as stream:
+            json.dump({
+                'version': __version__,
+                'python': sys.version,
+                'results': results,
+            }, stream, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
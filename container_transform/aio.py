@@ -0,0 +1,54 @@
+class ConversionPool(object):
+    """
+    Limits how many conversions an asyncio application runs at once.
+
+    Each conversion runs its steps in an executor with
+    ``Converter.aconvert()``, and waits for a free slot before it starts, so
+    a burst of requests can't queue up more work than the executor can keep
+    up with. A conversion of a huge file only takes one slot, and is split
+    into chunks that share the executor with the other conversions.
+
+    To use this class:
+
+    .. code-block:: python
+
+        pool = ConversionPool(limit=4)
+
+        async def handle(document):
+            converter = Converter(document, 'compose', 'ecs')
+            output = await pool.convert(converter)
+            return output, converter.messages
+
+    """
+
+    def __init__(self, limit=4, executor=None):
+        """
+        :param limit: The number of conversions to run at once
+        :type limit: int
+        :param executor: The executor to run each step in, defaults to the
+            event loop's default executor
+        :type executor: concurrent.futures.Executor
+        """
+        self.limit = limit
+        self.executor = executor
+        self._semaphore = None
+
+    async def convert(self, converter, verbose=True):
+        """
+        Wait for a free slot, then convert
+
+        :param converter: The conversion to run
+        :type converter: container_transform.converter.Converter
+        :param verbose: Print out newlines and indented output
+        :type verbose: bool
+
+        :rtype: str
+        """
+        import asyncio
+
+        # Created here so it belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+
+        async with self._semaphore:
+            return await converter.aconvert(verbose, executor=self.executor)
@@ -0,0 +1,119 @@
+import os
+import json
+import hashlib
+import tempfile
+
+from .version import __version__
+
+
+DEFAULT_MAX_SIZE = 64 << 20
+
+
+class ConversionCache(object):
+    """
+    A content-addressed on-disk cache of conversion output.
+
+    Entries are keyed by a hash of the input bytes, the input and output
+    types, the verbose flag and the package version. Once the cache grows
+    past ``max_size`` bytes, the least recently used entries are removed.
+
+    To use this class:
+
+    .. code-block:: python
+
+        cache = ConversionCache('~/.cache/container-transform')
+        converter = Converter('./docker-compose.yml', 'compose', 'ecs', cache=cache)
+        output = converter.convert()
+
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """
+        :param directory: The directory to store entries in, created if missing
+        :type directory: str
+        :param max_size: The maximum size of all entries in bytes
+        :type max_size: int
+        """
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(data, input_type, output_type, verbose):
+        """
+        :param data: The raw input
+        :type data: bytes
+
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        for part in (__version__, input_type, output_type, str(bool(verbose))):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, '{}.json'.format(key))
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used
+
+        :rtype: tuple of (str, set) or None
+        :returns: The output and messages, or ``None`` on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as stream:
+                entry = json.load(stream)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry['output'], set(entry['messages'])
+
+    def set(self, key, output, messages):
+        """
+        Store an entry, then evict old entries if the cache is too large
+
+        :param output: The converted output
+        :type output: str
+        :param messages: The messages produced during conversion
+        :type messages: set
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as stream:
+                json.dump({'output': output, 'messages': sorted(messages)}, stream)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits in
+        ``self.max_size``
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:  # pragma: no cover
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:  # pragma: no cover
+                pass
+            total -= size
@@ -4,33 +4,10 @@ import shlex
 
 from datetime import datetime
 
-from copy import deepcopy
-from functools import reduce
-from collections import Mapping, defaultdict
-
-from .schema import TransformationTypes, ARG_MAP
-from .transformer import BaseTransformer
-
-
-def update_nested_dict(d, u):
-    for k, v in u.items():
-        if isinstance(v, Mapping):
-            r = update_nested_dict(d.get(k, {}), v)
-            d[k] = r
-        elif isinstance(v, list):
-            if not d.get(k):
-                d[k] = v
-            else:
-                d[k] += v
-        else:
-            d[k] = u[k]
-    return d
-
-
-def lookup_nested_dict(dic, key, *keys):
-    if keys:
-        return lookup_nested_dict(dic.get(key, None), *keys)
-    return dic.get(key)
+from .paths import ParameterIndex, compile_paths, split_dotted_keys
+from .schema import TransformationTypes
+from .serialization import dump_json, load_json
+from .transformer import BaseTransformer, Logging, PortMapping, Volume
 
 
 class ChronosTransformer(BaseTransformer):
@@ -70,70 +47,38 @@ class ChronosTransformer(BaseTransformer):
         """
         Read in the json stream
         """
-        return json.load(stream)
-
-    def _lookup_parameter(self, container, key, common_type=None):
-        """
-        Lookup the `docker run` keyword from the 'container.docker.parameters' list
-        :param container: The container in question
-        :param key: The key name we're looking up
-        :param is_list: if the response is a list of items
-        """
-        if not container.get('container', {}).get('parameters'):
-            return
-        params = container['container']['parameters']
-
-        # Super hacky - log-opt is a sub option of the logging directive of everything else
-        if key == 'log-driver':
-            return [
-                p
-                for p
-                in params
-                if p['key'] in ['log-opt', 'log-driver']]
-
-        matching_params = [
-            p['value']
-            for p
-            in params
-            if p['key'] == key]
-
-        if matching_params:
-            if common_type == list:
-                return matching_params
-            else:
-                return matching_params[0]
+        return load_json(stream)
 
     def flatten_container(self, container):
         """
         Accepts a chronos container and pulls out the nested values into the top level
         """
-        for names in ARG_MAP.values():
-            if names[TransformationTypes.CHRONOS.value]['name'] and \
-                            '.' in names[TransformationTypes.CHRONOS.value]['name']:
-                chronos_dotted_name = names[TransformationTypes.CHRONOS.value]['name']
-                parts = chronos_dotted_name.split('.')
-
-                if parts[-2] == 'parameters':
-                    # Special lookup for docker parameters
-                    common_type = names[TransformationTypes.CHRONOS.value].get('type')
-                    result = self._lookup_parameter(container, parts[-1], common_type)
-                    if result:
-                        container[chronos_dotted_name] = result
-                else:
-                    result = lookup_nested_dict(container, *parts)
-                    if result:
-                        container[chronos_dotted_name] = result
+        indexes = {}
+        for path, common_type in compile_paths(TransformationTypes.CHRONOS.value):
+            if path.parameter:
+                # Docker parameters are looked up in an index of the list,
+                # built the first time one of them is needed
+                index = indexes.get(path.parameters)
+                if index is None:
+                    index = indexes[path.parameters] = ParameterIndex(
+                        path.parameters.get(container))
+                result = index.lookup(path.parameter, common_type)
+            else:
+                result = path.get(container)
+            if result:
+                container[path.name] = result
         return container
 
     def ingest_containers(self, containers=None):
+        return list(self.iter_containers(containers))
+
+    def iter_containers(self, containers=None):
         containers = containers or self.stream or {}
         # Accept lists of tasks for convenience
         if isinstance(containers, dict):
             containers = [containers]
-        return [
-            self.flatten_container(container)
-            for container
-            in containers]
+        for container in containers:
+            yield self.flatten_container(container)
 
     def emit_containers(self, containers, verbose=True):
         """
@@ -148,58 +93,80 @@ class ChronosTransformer(BaseTransformer):
         :returns: The text output
         :rtype: str
         """
+        containers = self.emit_document(containers)
+
+        if verbose:
+            return dump_json(containers, indent=4, sort_keys=True)
+        else:
+            return dump_json(containers)
+
+    def write_containers(self, containers, stream, verbose=True):
+        """
+        Writes the applications to ``stream``, encoding them a piece at a
+        time. Only the converted containers are buffered, to sort them.
+        """
+        if verbose:
+            encoder = json.JSONEncoder(indent=4, sort_keys=True)
+        else:
+            encoder = json.JSONEncoder()
+        for chunk in encoder.iterencode(self.emit_document(containers)):
+            stream.write(chunk)
+
+    def emit_document(self, containers):
+        """
+        Sorts the applications by name, and unwraps a single application
+
+        :param containers: The container definitions
+        :type containers: iterable of dict
+
+        :rtype: list of dict or dict
+        """
         containers = sorted(containers, key=lambda c: c.get('name'))
 
         if len(containers) == 1 and isinstance(containers, list):
             containers = containers[0]
+        return containers
 
-        if verbose:
-            return json.dumps(containers, indent=4, sort_keys=True)
-        else:
-            return json.dumps(containers)
+    def stream_containers(self, containers, stream):
+        """
+        Writes each application as a line of compact JSON
+
+        :param containers: The container definitions
+        :type containers: iterable of dict
+
+        :param stream: A writable file-like object
+        :type stream: file
+        """
+        for container in containers:
+            stream.write(dump_json(container, sort_keys=True))
+            stream.write('\n')
 
     def validate(self, container):
         # Ensure container name
         container_name = container.get('name', str(uuid.uuid4()))
         container['name'] = container_name
 
-        container_data = defaultdict(lambda: defaultdict(dict))
-        container_data.update(container)
-
-        # Find keys with periods in the name, these are keys that we delete and
-        # create the corresponding entry for
-        for key, value in deepcopy(container_data).items():
-            if key.startswith('container.'):
-                parts = key.split('.')
-
-                if parts[-2] == 'parameters':
-                    # Parameters are inserted below
-                    parts = parts[:-1]
-                    data = reduce(lambda x, y: {y: x}, reversed(parts + [value]))
-                    update_nested_dict(container_data, data)
-                    del container_data[key]
-                else:
-                    data = reduce(lambda x, y: {y: x}, reversed(parts + [value]))
-                    update_nested_dict(container_data, data)
-                    del container_data[key]
+        container_data, nested = split_dotted_keys(container)
+        container_data.update(nested)
+        task_container = container_data.setdefault('container', {})
 
         # Sort the parameters in a deterministic way
-        if container_data['container'].get('parameters'):
-            old_params = container_data['container']['parameters']
+        if task_container.get('parameters'):
+            old_params = task_container['parameters']
             sorted_values = sorted(
                 old_params, key=lambda p: str(p.get('value'))
             )
             sorted_keys = sorted(
                 sorted_values, key=lambda p: p.get('key')
             )
-            container_data['container']['parameters'] = sorted_keys
+            task_container['parameters'] = sorted_keys
 
         # Assume the network mode is BRIDGE if unspecified
-        if container_data['container'].get('network') != 'HOST':
-            container_data['container']['network'] = 'BRIDGE'
+        if task_container.get('network') != 'HOST':
+            task_container['network'] = 'BRIDGE'
 
-        container_data['container']['forcePullImage'] = True
-        container_data['container']['type'] = 'DOCKER'
+        task_container['forcePullImage'] = True
+        task_container['type'] = 'DOCKER'
         container_data['uris'] = []
         container_data['schedule'] = 'R/{now}/PT1H'.format(now=datetime.utcnow().isoformat())
         container_data['disabled'] = False
@@ -223,21 +190,15 @@ class ChronosTransformer(BaseTransformer):
     @staticmethod
     def _parse_port_mapping(mapping):
         protocol = 'udp' if 'udp' in str(mapping) else 'tcp'
-        output = {
-            'protocol': protocol
-        }
         mapping = str(mapping).rstrip('/udp')
         parts = str(mapping).split(':')
         if len(parts) == 1:
-            output.update({
-                'container_port': int(parts[0])
-            })
-        else:
-            output.update({
-                'host_port': int(parts[0]),
-                'container_port': int(parts[1]),
-            })
-        return output
+            return PortMapping(container_port=int(parts[0]), protocol=protocol)
+        return PortMapping(
+            host_port=int(parts[0]),
+            container_port=int(parts[1]),
+            protocol=protocol,
+        )
 
     def ingest_port_mappings(self, port_mappings):
         """
@@ -246,15 +207,16 @@ class ChronosTransformer(BaseTransformer):
         :param port_mappings: The port mappings
         :type port_mappings: list of dict
         :return: The base schema mappings
-        :rtype: list of dict
+        :rtype: list of PortMapping
         """
         return [self._parse_port_mapping(mapping) for mapping in port_mappings]
 
     def _construct_port_mapping(self, mapping):
-        output = str(mapping['container_port'])
-        if 'host_port' in mapping:
-            output = str(mapping['host_port']) + ':' + output
-        if mapping.get('protocol') == 'udp':
+        mapping = PortMapping.from_value(mapping)
+        output = str(mapping.container_port)
+        if mapping.host_port is not None:
+            output = str(mapping.host_port) + ':' + output
+        if mapping.protocol == 'udp':
             output += '/udp'
         return output
 
@@ -317,12 +279,11 @@ class ChronosTransformer(BaseTransformer):
         """
         This is for ingesting the "volumes" of a app description
         """
-        data = {
-            'host': volume.get('hostPath'),
-            'container': volume.get('containerPath'),
-            'readonly': volume.get('mode') == 'RO',
-        }
-        return data
+        return Volume(
+            host=volume.get('hostPath'),
+            container=volume.get('containerPath'),
+            readonly=volume.get('mode') == 'RO',
+        )
 
     def ingest_volumes(self, volumes):
         return [self._convert_volume(volume) for volume in volumes]
@@ -332,10 +293,11 @@ class ChronosTransformer(BaseTransformer):
         """
         Given a generic volume definition, create the volumes element
         """
+        volume = Volume.from_value(volume)
         return {
-            'hostPath': volume.get('host'),
-            'containerPath': volume.get('container'),
-            'mode': 'RO' if volume.get('readonly') else 'RW'
+            'hostPath': volume.host,
+            'containerPath': volume.container,
+            'mode': 'RO' if volume.readonly else 'RW'
         }
 
     def emit_volumes(self, volumes):
@@ -346,20 +308,20 @@ class ChronosTransformer(BaseTransformer):
         ]
 
     def ingest_logging(self, logging):
-        # Super hacky continued - in self._lookup_parameter() we flatten the logging options
-        data = {
-            'driver': [p['value'] for p in logging if p['key'] == 'log-driver'][0],
-            'options': dict([p['value'].split('=') for p in logging if p['key'] == 'log-opt'])
-        }
-        return data
+        # Super hacky continued - ParameterIndex flattens the logging options
+        return Logging(
+            driver=[p['value'] for p in logging if p['key'] == 'log-driver'][0],
+            options=dict([p['value'].split('=') for p in logging if p['key'] == 'log-opt'])
+        )
 
     def emit_logging(self, logging):
+        logging = Logging.from_value(logging)
         output = [{
             'key': 'log-driver',
-            'value': logging.get('driver')
+            'value': logging.driver
         }]
-        if logging.get('options') and isinstance(logging.get('options'), dict):
-            for k, v in logging.get('options').items():
+        if logging.options and isinstance(logging.options, dict):
+            for k, v in logging.options.items():
                 output.append({
                     'key': 'log-opt',
                     'value': '{k}={v}'.format(k=k, v=v)
@@ -1,3 +1,6 @@
+import io
+import os
+
 import click
 
 from .converter import Converter
@@ -7,6 +10,29 @@ from .version import __version__
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
+OUTPUT_EXTENSIONS = {
+    OutputTransformationTypes.ECS.value: 'json',
+    OutputTransformationTypes.COMPOSE.value: 'yml',
+    OutputTransformationTypes.SYSTEMD.value: 'service',
+    OutputTransformationTypes.MARATHON.value: 'json',
+    OutputTransformationTypes.CHRONOS.value: 'json',
+    OutputTransformationTypes.KUBERNETES.value: 'yaml',
+}
+
+
+class ChoiceList(click.Choice):
+    """
+    A comma separated list of choices
+    """
+    def convert(self, value, param, ctx):
+        if isinstance(value, (list, tuple)):
+            return value
+        return [
+            super(ChoiceList, self).convert(choice, param, ctx)
+            for choice
+            in value.split(',')
+        ]
+
 
 @click.command(context_settings=CONTEXT_SETTINGS)
 @click.argument(
@@ -26,10 +52,11 @@ CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 @click.option(
     '-o',
     '--output-type',
-    'output_type',
+    'output_types',
     envvar='CT_OUTPUT_TYPE',
-    type=click.Choice([v.value.lower() for v in list(OutputTransformationTypes)]),
+    type=ChoiceList([v.value.lower() for v in list(OutputTransformationTypes)]),
     default=OutputTransformationTypes.ECS.value,
+    help='One output type, or several separated by commas with --output-dir'
 )
 @click.option(
     '-v/--no-verbose',
@@ -47,8 +74,92 @@ CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
     is_flag=True,
     help='Silence error messages'
 )
+@click.option(
+    '--cache-dir',
+    'cache_dir',
+    envvar='CT_CACHE_DIR',
+    default=None,
+    type=click.Path(file_okay=False, dir_okay=True),
+    help='Reuse output of unchanged input from this directory'
+)
+@click.option(
+    '--manifest',
+    envvar='CT_MANIFEST',
+    default=None,
+    type=click.Path(file_okay=True, dir_okay=False),
+    help='Only convert services that changed since the fingerprints in this file'
+)
+@click.option(
+    '--ndjson',
+    envvar='CT_NDJSON',
+    default=False,
+    is_flag=True,
+    help='Stream one compact JSON object per container (ecs, marathon, chronos)'
+)
+@click.option(
+    '--lazy',
+    envvar='CT_LAZY',
+    default=False,
+    is_flag=True,
+    help='Write the output while converting one container at a time, to use less memory'
+)
+@click.option(
+    '--stats',
+    envvar='CT_STATS',
+    default=False,
+    is_flag=True,
+    help='Print the time spent in each conversion stage to stderr'
+)
+@click.option(
+    '--output-dir',
+    'output_dir',
+    envvar='CT_OUTPUT_DIR',
+    default=None,
+    type=click.Path(file_okay=False, dir_okay=True),
+    help='Write each output type to a file in this directory'
+)
+@click.option(
+    '--unit-dir',
+    'unit_dir',
+    envvar='CT_UNIT_DIR',
+    default=None,
+    type=click.Path(file_okay=False, dir_okay=True),
+    help='Write each systemd unit to its own file in this directory'
+)
+@click.option(
+    '--workload-dir',
+    'workload_dir',
+    envvar='CT_WORKLOAD_DIR',
+    default=None,
+    type=click.Path(file_okay=False, dir_okay=True),
+    help='Convert each workload of a kubernetes input to its own file in this directory'
+)
+@click.option(
+    '-j',
+    '--jobs',
+    envvar='CT_JOBS',
+    default=1,
+    type=int,
+    help='Number of processes to write several output types with'
+)
+@click.option(
+    '-w',
+    '--workers',
+    envvar='CT_WORKERS',
+    default=1,
+    type=int,
+    help='Number of threads to convert the containers of a large input with'
+)
+@click.option(
+    '--watch',
+    envvar='CT_WATCH',
+    default=False,
+    is_flag=True,
+    help='Convert again whenever INPUT_FILE changes'
+)
 @click.version_option(__version__)
-def transform(input_file, input_type, output_type, verbose, quiet):
+def transform(input_file, input_type, output_types, verbose, quiet, cache_dir, manifest, ndjson,
+              lazy, stats, output_dir, unit_dir, workload_dir, jobs, workers, watch):
     """
     container-transform is a small utility to transform various docker
     container formats to one another.
@@ -60,11 +171,269 @@ def transform(input_file, input_type, output_type, verbose, quiet):
     All options may be set by environment variables with the prefix "CT_"
     followed by the full argument name.
     """
-    converter = Converter(input_file, input_type, output_type)
-    output = converter.convert(verbose)
+    _check_options(input_file, output_types, manifest, ndjson, output_dir, watch)
+    _check_mode_options(
+        output_types, cache_dir, manifest, ndjson, lazy, output_dir, unit_dir, workload_dir,
+        workers, watch)
+
+    cache = _cache(cache_dir)
+    manifest = _manifest(manifest)
+
+    def run(source):
+        if output_dir:
+            converter = Converter(source, input_type, None)
+            outputs = converter.convert_outputs(output_types, verbose, jobs)
+            _write_outputs(outputs, output_dir, quiet)
+        elif unit_dir:
+            converter = Converter(source, input_type, output_types[0], workers=workers)
+            _write_units(converter, unit_dir, quiet)
+        elif workload_dir:
+            converter = Converter(source, input_type, output_types[0], workers=workers)
+            _write_workloads(converter, workload_dir, verbose, quiet)
+        else:
+            converter = Converter(
+                source, input_type, output_types[0], cache=cache, workers=workers,
+                manifest=manifest)
+            _echo_output(converter, verbose, ndjson, lazy)
+
+        if not quiet:
+            for message in converter.messages:
+                click.echo(click.style(message, fg='red', bold=True), err=True)
+
+        if stats:
+            click.echo(str(converter.stats), err=True)
+
+    if watch:
+        _watch(input_file, run, quiet)
+    else:
+        run(input_file)
+
+
+def _check_options(input_file, output_types, manifest, ndjson, output_dir, watch):
+    if manifest and (ndjson or output_dir):
+        raise click.UsageError('--manifest can not be used with --ndjson or --output-dir')
+    if ndjson and output_dir:
+        raise click.UsageError('--ndjson can not be used with --output-dir')
+    if len(output_types) > 1 and not output_dir:
+        raise click.UsageError('Several output types need an --output-dir')
+    if watch and input_file == '/dev/stdin':
+        raise click.UsageError('--watch needs an INPUT_FILE')
+
+
+def _check_mode_options(output_types, cache_dir, manifest, ndjson, lazy, output_dir, unit_dir,
+                        workload_dir, workers, watch):
+    if cache_dir:
+        _check_cache_dir_options(ndjson, output_dir, watch)
+    if lazy:
+        _check_lazy_options(cache_dir, manifest, ndjson, output_dir, workers)
+    if workers > 1:
+        _check_workers_options(manifest, ndjson, output_dir)
+    if unit_dir:
+        _check_unit_dir_options(output_types, cache_dir, manifest, ndjson, lazy, output_dir)
+    if workload_dir:
+        _check_workload_dir_options(cache_dir, manifest, ndjson, lazy, output_dir, unit_dir)
+
+
+def _check_cache_dir_options(ndjson, output_dir, watch):
+    # These convert without the cache, so nothing would be cached
+    if ndjson or output_dir or watch:
+        raise click.UsageError(
+            '--cache-dir can not be used with --ndjson, --output-dir or --watch')
+
+
+def _check_lazy_options(cache_dir, manifest, ndjson, output_dir, workers):
+    if cache_dir or manifest or ndjson or output_dir:
+        raise click.UsageError(
+            '--lazy can not be used with --cache-dir, --manifest, --ndjson or --output-dir')
+    if workers > 1:
+        raise click.UsageError('--lazy can not be used with --workers')
+
+
+def _check_workers_options(manifest, ndjson, output_dir):
+    # These always convert the containers in turn
+    if manifest or ndjson or output_dir:
+        raise click.UsageError(
+            '--workers can not be used with --manifest, --ndjson or --output-dir')
+
+
+def _check_unit_dir_options(output_types, cache_dir, manifest, ndjson, lazy, output_dir):
+    if list(output_types) != [OutputTransformationTypes.SYSTEMD.value]:
+        raise click.UsageError('--unit-dir needs the systemd output type')
+    if cache_dir or manifest or ndjson or lazy or output_dir:
+        raise click.UsageError(
+            '--unit-dir can not be used with --cache-dir, --manifest, --ndjson, --lazy or '
+            '--output-dir')
+
+
+def _check_workload_dir_options(cache_dir, manifest, ndjson, lazy, output_dir, unit_dir):
+    if cache_dir or manifest or ndjson or lazy or output_dir or unit_dir:
+        raise click.UsageError(
+            '--workload-dir can not be used with --cache-dir, --manifest, --ndjson, --lazy, '
+            '--output-dir or --unit-dir')
+
+
+def _watch(input_file, run, quiet):
+    """
+    Convert each new version of ``input_file`` in this process, so the
+    transformers stay imported and the conversion plans stay compiled
+    """
+    from .watch import FileWatcher
+
+    if not quiet:
+        click.echo('Watching {} for changes'.format(input_file), err=True)
+    try:
+        for data in FileWatcher(input_file).changes():
+            try:
+                run(io.StringIO(data.decode('utf-8')))
+            except click.ClickException:
+                raise
+            except Exception as e:
+                # Keep watching, the next edit may fix the input
+                click.echo(
+                    click.style('{}: {}'.format(type(e).__name__, e), fg='red', bold=True),
+                    err=True
+                )
+    except KeyboardInterrupt:
+        pass
+
+
+def _cache(cache_dir):
+    if not cache_dir:
+        return None
+    from .cache import ConversionCache
+    return ConversionCache(cache_dir)
+
+
+def _manifest(path):
+    if not path:
+        return None
+    from .manifest import FingerprintManifest
+    return FingerprintManifest(path)
+
+
+def _echo_output(converter, verbose, ndjson, lazy):
+    if ndjson:
+        try:
+            converter.convert_stream(click.get_text_stream('stdout'))
+        except NotImplementedError:
+            raise click.UsageError(
+                '--ndjson is not supported for output type {}'.format(converter.output_type))
+    elif lazy:
+        stdout = click.get_text_stream('stdout')
+        converter.write(stdout, verbose)
+        stdout.write('\n')
+    else:
+        output = converter.convert(verbose)
+        click.echo(click.style(output, fg='green'))
+
+
+def _write_outputs(outputs, output_dir, quiet):
+    os.makedirs(output_dir, exist_ok=True)
+    for output_type, output in sorted(outputs.items()):
+        filename = os.path.join(
+            output_dir, '{}.{}'.format(output_type, OUTPUT_EXTENSIONS[output_type]))
+        with open(filename, 'w') as stream:
+            stream.write(output + '\n')
+        if not quiet:
+            click.echo('Wrote {}'.format(filename), err=True)
 
-    click.echo(click.style(output, fg='green'))
 
+def _write_units(converter, unit_dir, quiet):
+    try:
+        written = converter.write_units(unit_dir)
+    except ValueError as e:
+        raise click.ClickException(str(e))
     if not quiet:
-        for message in converter.messages:
-            click.echo(click.style(message, fg='red', bold=True), err=True)
+        for filename, changed in written.items():
+            if changed:
+                click.echo('Wrote {}'.format(filename), err=True)
+        unchanged = sum(1 for changed in written.values() if not changed)
+        if unchanged:
+            click.echo('{} unchanged'.format(unchanged), err=True)
+
+
+def _write_workloads(converter, workload_dir, verbose, quiet):
+    try:
+        filenames = set()
+        for workload, output in converter.convert_workloads(verbose):
+            os.makedirs(workload_dir, exist_ok=True)
+            filename = _workload_filename(workload, filenames)
+            filename = os.path.join(
+                workload_dir, '{}.{}'.format(filename, OUTPUT_EXTENSIONS[converter.output_type]))
+            with open(filename, 'w') as stream:
+                stream.write(output + '\n')
+            if not quiet:
+                click.echo('Wrote {}'.format(filename), err=True)
+    except NotImplementedError:
+        raise click.UsageError(
+            '--workload-dir is not supported for input type {}'.format(converter.input_type))
+
+
+def _workload_filename(workload, filenames):
+    """
+    Name the output of a workload ``<namespace>-<kind>-<name>``, adding a
+    number if a workload of the same name was already written
+
+    :param filenames: The names already used, which the new name is added to
+    :type filenames: set
+    """
+    metadata = workload.get('metadata') or {}
+    parts = [metadata.get('namespace'), workload.get('kind'), metadata.get('name')]
+    base = '-'.join(str(part) for part in parts if part).lower().replace(os.sep, '_')
+    filename, idx = base, 1
+    while filename in filenames:
+        idx += 1
+        filename = '{}-{}'.format(base, idx)
+    filenames.add(filename)
+    return filename
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.option(
+    '--host',
+    envvar='CT_HOST',
+    default='127.0.0.1',
+    help='Address to listen on'
+)
+@click.option(
+    '-p',
+    '--port',
+    envvar='CT_PORT',
+    default=8080,
+    type=int,
+    help='Port to listen on'
+)
+@click.option(
+    '-s',
+    '--socket',
+    'socket_path',
+    envvar='CT_SOCKET',
+    default=None,
+    type=click.Path(file_okay=True, dir_okay=False),
+    help='Listen on a unix socket instead of a port'
+)
+@click.version_option(__version__)
+def serve(host, port, socket_path):
+    """
+    container-transform-serve keeps the transformers loaded and converts
+    documents POSTed as JSON, to avoid the interpreter start up cost of
+    running container-transform for each file.
+
+    All options may be set by environment variables with the prefix "CT_"
+    followed by the full argument name.
+    """
+    from .server import make_server
+
+    server = make_server(host, port, socket_path)
+    click.echo(
+        'Listening on {}'.format(socket_path or 'http://{}:{}/'.format(*server.server_address)),
+        err=True
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path:
+            os.remove(socket_path)
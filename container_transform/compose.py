@@ -1,9 +1,8 @@
 import uuid
 from functools import reduce
 
-import yaml
-
-from .transformer import BaseTransformer
+from .serialization import yaml_backend
+from .transformer import BaseTransformer, Logging, PortMapping, Volume
 
 
 class ComposeTransformer(BaseTransformer):
@@ -18,6 +17,8 @@ class ComposeTransformer(BaseTransformer):
         normalized_keys = transformer.ingest_containers()
 
     """
+    context_attributes = ('stream_version',)
+
     def __init__(self, filename=None):
         """
         We override ``.__init__()`` on purpose, we need to get the volume,
@@ -41,25 +42,41 @@ class ComposeTransformer(BaseTransformer):
             self.stream = None
 
     def _read_stream(self, stream):
-        return yaml.safe_load(stream=stream)
+        return yaml_backend().load(stream)
 
     def ingest_containers(self, containers=None):
         """
         Transform the YAML into a dict with normalized keys
         """
-        containers = containers or self.stream or {}
+        return list(self.iter_containers(containers))
 
-        output_containers = []
+    def iter_containers(self, containers=None):
+        containers = containers or self.stream or {}
 
         for container_name, definition in containers.items():
             container = definition.copy()
             container['name'] = container_name
-            output_containers.append(container)
-
-        return output_containers
+            yield container
 
     def emit_containers(self, containers, verbose=True):
+        return self._dump(self.emit_document(containers))
+
+    def write_containers(self, containers, stream, verbose=True):
+        self._dump(self.emit_document(containers), stream)
 
+    @staticmethod
+    def _dump(output, stream=None):
+        return yaml_backend().dump(output, stream)
+
+    def emit_document(self, containers):
+        """
+        Builds a version 2 compose file, keyed by service name
+
+        :param containers: The container definitions
+        :type containers: iterable of dict
+
+        :rtype: dict
+        """
         services = {}
         for container in containers:
             name_in_container = container.get('name')
@@ -69,19 +86,11 @@ class ComposeTransformer(BaseTransformer):
                 name = container.pop('name')
             services[name] = container
 
-        output = {
+        return {
             'services': services,
             'version': '2',
         }
 
-        noalias_dumper = yaml.dumper.SafeDumper
-        noalias_dumper.ignore_aliases = lambda self, data: True
-        return yaml.dump(
-            output,
-            default_flow_style=False,
-            Dumper=noalias_dumper
-        )
-
     @staticmethod
     def validate(container):
 
@@ -90,41 +99,42 @@ class ComposeTransformer(BaseTransformer):
     @staticmethod
     def _parse_port_mapping(mapping):
         protocol = 'udp' if 'udp' in str(mapping) else 'tcp'
-        output = {
-            'protocol': protocol
-        }
         mapping = str(mapping).rstrip('/udp')
         parts = str(mapping).split(':')
         if len(parts) == 1:
-            output.update({
-                'container_port': int(parts[0])
-            })
+            return PortMapping(
+                container_port=int(parts[0]),
+                protocol=protocol,
+            )
         elif len(parts) == 2 and '.' not in mapping:
-            output.update({
-                'host_port': int(parts[0]),
-                'container_port': int(parts[1]),
-            })
+            return PortMapping(
+                host_port=int(parts[0]),
+                container_port=int(parts[1]),
+                protocol=protocol,
+            )
         elif len(parts) == 3:
             if '.' in parts[0]:
-                output.update({
-                    'host_ip': parts[0],
-                    'host_port': int(parts[1]),
-                    'container_port': int(parts[2]),
-                })
-            else:
-                output.update({
-                    'host_port': int(parts[0]),
-                    'container_ip': parts[1],
-                    'container_port': int(parts[2]),
-                })
+                return PortMapping(
+                    host_ip=parts[0],
+                    host_port=int(parts[1]),
+                    container_port=int(parts[2]),
+                    protocol=protocol,
+                )
+            return PortMapping(
+                host_port=int(parts[0]),
+                container_ip=parts[1],
+                container_port=int(parts[2]),
+                protocol=protocol,
+            )
         elif len(parts) == 4:
-            output.update({
-                'host_ip': parts[0],
-                'host_port': int(parts[1]),
-                'container_ip': parts[2],
-                'container_port': int(parts[3]),
-            })
-        return output if len(output) >= 2 else None
+            return PortMapping(
+                host_ip=parts[0],
+                host_port=int(parts[1]),
+                container_ip=parts[2],
+                container_port=int(parts[3]),
+                protocol=protocol,
+            )
+        return None
 
     def ingest_port_mappings(self, port_mappings):
         """
@@ -133,30 +143,27 @@ class ComposeTransformer(BaseTransformer):
         :param port_mappings: The compose port mappings
         :type port_mappings: list
         :return: the base schema port_mappings
-        :rtype: list of dict
+        :rtype: list of PortMapping
         """
         return [self._parse_port_mapping(mapping) for mapping in port_mappings]
 
     @staticmethod
     def _emit_mapping(mapping):
-        parts = []
-        if mapping.get('host_ip'):
-            parts.append(str(mapping['host_ip']))
-        if mapping.get('host_port'):
-            parts.append(str(mapping['host_port']))
-        if mapping.get('container_ip'):
-            parts.append(str(mapping['container_ip']))
-        if mapping.get('container_port'):
-            parts.append(str(mapping['container_port']))
-        output = ':'.join(parts)
-        if mapping.get('protocol') == 'udp':
+        mapping = PortMapping.from_value(mapping)
+        output = ':'.join(
+            str(part)
+            for part
+            in (mapping.host_ip, mapping.host_port, mapping.container_ip, mapping.container_port)
+            if part
+        )
+        if mapping.protocol == 'udp':
             output += '/udp'
         return output
 
     def emit_port_mappings(self, port_mappings):
         """
         :param port_mappings: the base schema port_mappings
-        :type port_mappings: list of dict
+        :type port_mappings: list of PortMapping
         :return:
         :rtype: list of str
         """
@@ -271,32 +278,15 @@ class ComposeTransformer(BaseTransformer):
         parts = volume.split(':')
 
         if len(parts) == 1:
-            return {
-                'host': parts[0],
-                'container': parts[0]
-            }
+            return Volume(host=parts[0], container=parts[0])
         if len(parts) == 2 and parts[1] != 'ro':
-            return {
-                'host': parts[0],
-                'container': parts[1]
-            }
+            return Volume(host=parts[0], container=parts[1])
         if len(parts) == 2 and parts[1] == 'ro':
-            return {
-                'host': parts[0],
-                'container': parts[0],
-                'readonly': True
-            }
+            return Volume(host=parts[0], container=parts[0], readonly=True)
         if len(parts) == 3 and parts[-1] == 'ro':
-            return {
-                'host': parts[0],
-                'container': parts[1],
-                'readonly': True
-            }
+            return Volume(host=parts[0], container=parts[1], readonly=True)
         if len(parts) == 3 and parts[-1] == 'rw':
-            return {
-                'host': parts[0],
-                'container': parts[1],
-            }
+            return Volume(host=parts[0], container=parts[1])
 
     def ingest_volumes(self, volumes):
         return [
@@ -308,20 +298,18 @@ class ComposeTransformer(BaseTransformer):
 
     @staticmethod
     def _emit_volume(volume):
-        volume_str = '{0}:{1}'.format(volume.get('host'), volume.get('container', ':'))
+        volume = Volume.from_value(volume)
+        container = ':' if volume.container is None else volume.container
+        volume_str = '{0}:{1}'.format(volume.host, container)
         volume_str = volume_str.strip(':')
 
-        if volume.get('readonly') and len(volume_str):
+        if volume.readonly and len(volume_str):
             volume_str += ':ro'
         return volume_str
 
     def emit_volumes(self, volumes):
-        return [
-            self._emit_volume(volume)
-            for volume
-            in volumes
-            if len(self._emit_volume(volume))
-        ]
+        emitted = (self._emit_volume(volume) for volume in volumes)
+        return [volume_str for volume_str in emitted if len(volume_str)]
 
     @staticmethod
     def _parse_label_string(label):
@@ -344,10 +332,10 @@ class ComposeTransformer(BaseTransformer):
         return labels
 
     def ingest_logging(self, logging):
-        return logging
+        return Logging.from_value(logging)
 
     def emit_logging(self, logging):
-        return logging
+        return Logging.from_value(logging).as_dict()
 
     def ingest_privileged(self, privileged):
         return privileged
@@ -1,35 +1,169 @@
+import io
+import json
+import time
+from collections import namedtuple
+from collections.abc import Mapping
+from functools import lru_cache
+from importlib import import_module
+
 from .schema import TransformationTypes, ARG_MAP
+from .stats import ConversionStats
+from .transformer import Container
+
 
-from .compose import ComposeTransformer
-from .ecs import ECSTransformer
-from .systemd import SystemdTransformer
-from .marathon import MarathonTransformer
-from .chronos import ChronosTransformer
-from container_transform.kubernetes import KubernetesTransformer
-
-
-TRANSFORMER_CLASSES = {
-    TransformationTypes.COMPOSE.value: ComposeTransformer,
-    TransformationTypes.ECS.value: ECSTransformer,
-    TransformationTypes.SYSTEMD.value: SystemdTransformer,
-    TransformationTypes.MARATHON.value: MarathonTransformer,
-    TransformationTypes.CHRONOS.value: ChronosTransformer,
-    TransformationTypes.KUBERNETES.value: KubernetesTransformer,
+TRANSFORMER_MODULES = {
+    TransformationTypes.COMPOSE.value: ('.compose', 'ComposeTransformer'),
+    TransformationTypes.ECS.value: ('.ecs', 'ECSTransformer'),
+    TransformationTypes.SYSTEMD.value: ('.systemd', 'SystemdTransformer'),
+    TransformationTypes.MARATHON.value: ('.marathon', 'MarathonTransformer'),
+    TransformationTypes.CHRONOS.value: ('.chronos', 'ChronosTransformer'),
+    TransformationTypes.KUBERNETES.value: ('.kubernetes', 'KubernetesTransformer'),
 }
 
 
+class LazyTransformerClasses(Mapping):
+    """
+    Maps a transformation type to its transformer class, only importing the
+    transformer module when it is first looked up. This keeps conversions
+    that don't need them from importing PyYAML or Jinja2.
+    """
+
+    def __getitem__(self, key):
+        module_name, class_name = TRANSFORMER_MODULES[key]
+        return getattr(import_module(module_name, __package__), class_name)
+
+    def __iter__(self):
+        return iter(TRANSFORMER_MODULES)
+
+    def __len__(self):
+        return len(TRANSFORMER_MODULES)
+
+
+TRANSFORMER_CLASSES = LazyTransformerClasses()
+
+ConversionResult = namedtuple('ConversionResult', ['filename', 'output', 'messages', 'error'])
+
+
+def _convert_file(filename, input_type, output_type, verbose):
+    """
+    Convert a single file for ``Converter.convert_many()``. Any exception is
+    caught and reported in the result so one bad file doesn't abort a batch.
+
+    :rtype: ConversionResult
+    """
+    converter = Converter(filename, input_type, output_type)
+    try:
+        output = converter.convert(verbose)
+    except Exception as e:
+        return ConversionResult(
+            filename, None, converter.messages, '{}: {}'.format(type(e).__name__, e))
+    return ConversionResult(filename, output, converter.messages, None)
+
+
+def _emit_output(input_type, output_type, ingested, verbose):
+    """
+    Emit already ingested containers to one output type for
+    ``Converter.convert_outputs()``
+
+    :rtype: tuple of (str, str, set, ConversionStats)
+    :returns: The output type, output, messages and stats
+    """
+    converter = Converter(None, input_type, output_type)
+    output = converter._emit_ingested(ingested, verbose)
+    return output_type, output, converter.messages, converter.stats
+
+
+@lru_cache(maxsize=None)
+def compile_ingest_plan(input_type):
+    """
+    Compile the ``ARG_MAP`` lookups for the parameters an input format can
+    ingest into the base schema.
+
+    :param input_type: The input format
+    :type input_type: str
+    :rtype: tuple of tuple
+    :returns: ``(parameter, input_name)`` steps
+    """
+    input_class = TRANSFORMER_CLASSES.get(input_type)
+    return tuple(
+        (parameter, options.get(input_type, {}).get('name'))
+        for parameter, options
+        in ARG_MAP.items()
+        if options.get(input_type, {}).get('name') and
+        hasattr(input_class, 'ingest_{}'.format(parameter))
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_plan(input_type, output_type):
+    """
+    Compile the ``ARG_MAP`` lookups for an input/output pair into a flat
+    tuple of steps. The plan only depends on the two formats, so it is built
+    once per pair and reused for every container.
+
+    Each step is a tuple of ``(parameter, input_name, output_name, required)``.
+    ``parameter`` is ``None`` when the step only checks for a required output
+    parameter and there is nothing to convert.
+
+    :param input_type: The input format
+    :type input_type: str
+    :param output_type: The output format
+    :type output_type: str
+    :rtype: tuple of tuple
+    """
+    input_class = TRANSFORMER_CLASSES.get(input_type)
+    output_class = TRANSFORMER_CLASSES.get(output_type)
+
+    plan = []
+    for parameter, options in ARG_MAP.items():
+        output_name = options.get(output_type, {}).get('name')
+        output_required = options.get(output_type, {}).get('required')
+
+        input_name = options.get(input_type, {}).get('name')
+
+        convertable = hasattr(input_class, 'ingest_{}'.format(parameter)) and \
+            output_name and hasattr(output_class, 'emit_{}'.format(parameter))
+
+        if convertable or output_required:
+            plan.append((
+                parameter if convertable else None,
+                input_name,
+                output_name,
+                output_required,
+            ))
+    return tuple(plan)
+
+
 class Converter(object):
 
-    def __init__(self, filename, input_type, output_type):
+    def __init__(self, filename, input_type, output_type, cache=None, workers=None,
+                 chunk_size=1000, manifest=None):
         """
-        :param filename: The file to be loaded
-        :type filename: str
+        :param filename: The file to be loaded, an open file-like object, or
+            the already parsed input. Parsed input may be modified.
+        :type filename: str or file or dict or list
         :param input_type: The output class for the transformer
         :type input_type: str
         :param output_type: The output class for the transformer
         :type output_type: str
+        :param cache: An optional cache of previous conversions, only used
+            when ``filename`` is a path
+        :type cache: container_transform.cache.ConversionCache
+        :param workers: The number of threads to convert and validate
+            containers with. By default containers are converted serially.
+        :type workers: int
+        :param chunk_size: The number of containers each thread converts at a
+            time
+        :type chunk_size: int
+        :param manifest: An optional manifest of the services converted
+            previously, to only convert services that changed since
+        :type manifest: container_transform.manifest.FingerprintManifest
         """
         self._filename = filename
+        self._cache = cache
+        self._manifest = manifest
+        self.workers = workers
+        self.chunk_size = chunk_size
 
         self.input_type = input_type
         self._input_class = TRANSFORMER_CLASSES.get(input_type)
@@ -37,66 +171,605 @@ class Converter(object):
         self._output_class = TRANSFORMER_CLASSES.get(output_type)
 
         self.messages = set()
+        self.stats = ConversionStats()
 
     def convert(self, verbose=True):
         """
         :rtype: tuple
         :returns: Output containers, messages
         """
-        input_transformer = self._input_class(self._filename)
+        if self._cache is None or not isinstance(self._filename, str):
+            return self._convert(self._filename, verbose)
+
+        with open(self._filename, 'rb') as stream:
+            data = stream.read()
+
+        key = self._cache.key(data, self.input_type, self.output_type, verbose)
+        cached = self._cache.get(key)
+        if cached is not None:
+            output, messages = cached
+            self.messages.update(messages)
+            return output
+
+        output = self._convert(io.StringIO(data.decode('utf-8')), verbose)
+        self._cache.set(key, output, self.messages)
+        return output
+
+    async def aconvert(self, verbose=True, executor=None):
+        """
+        Convert without blocking the event loop. Reading, ingesting, each
+        chunk of ``chunk_size`` containers and emitting are each run in
+        ``executor``, so the loop can serve other tasks in between, and
+        cancelling the task stops the conversion after the current step.
+
+        With a ``cache`` or ``manifest``, the whole of ``.convert()`` is run
+        in ``executor`` as one step.
+
+        .. code-block:: python
+
+            output = await Converter('./docker-compose.yml', 'compose', 'ecs').aconvert()
+
+        :param verbose: Print out newlines and indented output
+        :type verbose: bool
+        :param executor: The executor to run each step in, defaults to the
+            event loop's default executor
+        :type executor: concurrent.futures.Executor
+
+        :rtype: str
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if self._cache is not None or self._manifest is not None:
+            return await loop.run_in_executor(executor, self.convert, verbose)
+
+        input_transformer = await loop.run_in_executor(executor, self._read, self._filename)
         output_transformer = self._output_class()
+        containers = await loop.run_in_executor(executor, self._ingest, input_transformer)
 
-        containers = input_transformer.ingest_containers()
+        output_containers = []
+        for idx in range(0, len(containers), self.chunk_size):
+            result = await loop.run_in_executor(
+                executor, self._convert_chunk, input_transformer,
+                containers[idx:idx + self.chunk_size])
+            output_containers.extend(self._merge_chunk(output_transformer, result))
+
+        return await loop.run_in_executor(
+            executor, self._emit, output_transformer, output_containers, verbose)
+
+    def convert_stream(self, stream):
+        """
+        Write the output to ``stream`` as newline delimited JSON, one compact
+        object per container, as soon as each container is validated.
+        Containers are written in input order rather than sorted.
+
+        Only JSON output types support streaming.
+
+        :param stream: A writable file-like object
+        :type stream: file
+        """
+        self._write_lazily(
+            lambda transformer, containers: transformer.stream_containers(containers, stream))
+
+    def write(self, stream, verbose=True):
+        """
+        Write the same output as ``.convert()`` to ``stream``, ingesting,
+        converting and validating one container at a time. Only what the
+        output format needs is buffered: systemd units are written as soon as
+        each container is converted, and the other formats keep just the
+        converted containers, to sort them, rather than the ingested input
+        and the whole serialized output.
+
+        .. code-block:: python
+
+            with open('./task-definition.json', 'w') as stream:
+                Converter('./docker-compose.yml', 'compose', 'ecs').write(stream)
+
+        :param stream: A writable file-like object
+        :type stream: file
+        :param verbose: Print out newlines and indented output
+        :type verbose: bool
+        """
+        self._write_lazily(
+            lambda transformer, containers: transformer.write_containers(
+                containers, stream, verbose))
+
+    def write_units(self, directory):
+        """
+        Write each container to its own file in ``directory``, such as
+        ``<name>.service`` for each systemd unit. Files are replaced
+        atomically and only when their content changed, by ``workers``
+        threads.
+
+        Only output types with one file per container support this.
+
+        .. code-block:: python
+
+            converter = Converter('./docker-compose.yml', 'compose', 'systemd')
+            written = converter.write_units('./units')
+
+        :param directory: The directory to write the files to, created if it
+            doesn't exist
+        :type directory: str
+
+        :rtype: dict
+        :returns: Whether each file was written, keyed by its path
+        """
+        return self._write_lazily(
+            lambda transformer, containers: transformer.write_units(
+                containers, directory, self.workers))
+
+    def convert_workloads(self, verbose=True):
+        """
+        Convert each workload of the input, such as every Deployment, Pod or
+        item of a ``List`` in a bundle of Kubernetes manifests, to its own
+        output. Documents are parsed as they are needed, so only one workload
+        is held at a time.
+
+        Only input types with several workloads per input support this.
+
+        .. code-block:: python
+
+            converter = Converter('./bundle.yaml', 'kubernetes', 'ecs')
+            for workload, output in converter.convert_workloads():
+                print(workload['metadata']['name'], output)
+
+        :param verbose: Print out newlines and indented output
+        :type verbose: bool
+
+        :rtype: generator of tuple of (dict, str)
+        :returns: Each workload, and its output
+        """
+        workloads = self._timed('read', self._input_class.iter_workloads(self._filename))
+        for workload in workloads:
+            converter = Converter(
+                workload, self.input_type, self.output_type, workers=self.workers,
+                chunk_size=self.chunk_size)
+            output = converter.convert(verbose)
+            self.messages.update(converter.messages)
+            self.stats.merge(converter.stats)
+            yield workload, output
+
+    def _write_lazily(self, write):
+        input_transformer = self._read(self._filename)
+        output_transformer = self._output_class()
+
+        # Writing interleaves emitting with converting, so the emit time is
+        # whatever isn't spent in the earlier stages
+        start = time.perf_counter()
+        converting = sum(self.stats.seconds.values())
+        result = write(
+            output_transformer, self._convert_lazily(input_transformer, output_transformer))
+        converting = sum(self.stats.seconds.values()) - converting
+        self.stats.add('emit', time.perf_counter() - start - converting)
+        return result
+
+    def _read(self, source):
+        start = time.perf_counter()
+        input_transformer = self._input_class(source)
+        self.stats.add('read', time.perf_counter() - start)
+        return input_transformer
+
+    def convert_document(self):
+        """
+        Convert without serializing the output, to skip dumping and then
+        re-parsing it when the caller works with Python objects.
+
+        .. code-block:: python
+
+            task = {'containerDefinitions': [{'name': 'web', 'image': 'nginx'}]}
+            converter = Converter(task, 'ecs', 'marathon')
+            app = converter.convert_document()
+
+        :returns: The output document, as from the output transformer's
+            ``emit_document()``
+        :rtype: dict or list
+        """
+        output_transformer, output_containers = self._convert_all(self._filename)
+
+        start = time.perf_counter()
+        output = output_transformer.emit_document(output_containers)
+        self.stats.add('emit', time.perf_counter() - start)
+        return output
+
+    def _convert(self, source, verbose):
+        output_transformer, output_containers = self._convert_all(source)
+        return self._emit(output_transformer, output_containers, verbose)
+
+    def _emit(self, output_transformer, output_containers, verbose):
+        start = time.perf_counter()
+        output = output_transformer.emit_containers(output_containers, verbose)
+        self.stats.add('emit', time.perf_counter() - start)
+        return output
+
+    def _convert_all(self, source):
+        input_transformer = self._read(source)
+        output_transformer = self._output_class()
+
+        if self._manifest is not None:
+            output_containers = self._convert_incremental(input_transformer, output_transformer)
+        elif self.workers and self.workers > 1:
+            output_containers = self._convert_parallel(input_transformer, output_transformer)
+        else:
+            output_containers = list(
+                self._convert_containers(input_transformer, output_transformer))
+        return output_transformer, output_containers
+
+    def _convert_parallel(self, input_transformer, output_transformer):
+        """
+        Convert and validate the ingested containers in chunks across a
+        thread pool. Each chunk gets its own output transformer and
+        messages, which are merged back in chunk order so the output is
+        the same as a serial conversion.
+
+        :rtype: list of dict
+        """
+        containers = self._ingest(input_transformer)
+        chunks = [
+            containers[idx:idx + self.chunk_size]
+            for idx
+            in range(0, len(containers), self.chunk_size)
+        ]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(
+                lambda chunk: self._convert_chunk(input_transformer, chunk), chunks))
 
         output_containers = []
+        for result in results:
+            output_containers.extend(self._merge_chunk(output_transformer, result))
+        return output_containers
+
+    def _ingest(self, input_transformer):
+        start = time.perf_counter()
+        containers = list(input_transformer.ingest_containers())
+        self.stats.add('ingest', time.perf_counter() - start)
+        return containers
+
+    def _convert_chunk(self, input_transformer, chunk):
+        converter = Converter(None, self.input_type, self.output_type)
+        output_transformer = self._output_class()
+
+        validated = list(
+            converter._convert_ingested(chunk, input_transformer, output_transformer))
+        return output_transformer, converter, validated
+
+    def _merge_chunk(self, output_transformer, result):
+        """
+        Merge the state, messages and stats of a chunk from
+        ``._convert_chunk()``
+
+        :returns: The chunk's validated containers
+        :rtype: list of dict
+        """
+        chunk_transformer, chunk_converter, validated = result
+        output_transformer.merge(chunk_transformer)
+        self.messages.update(chunk_converter.messages)
+        self.stats.merge(chunk_converter.stats)
+        return validated
+
+    def _convert_incremental(self, input_transformer, output_transformer):
+        """
+        Convert only the containers whose fingerprint isn't in the manifest,
+        and reuse the previous output and transformer state for the rest.
+        The manifest is then replaced with the current containers.
+
+        :rtype: list of dict
+        """
+        containers = self._ingest(input_transformer)
+
+        context = dict(
+            (attribute, getattr(input_transformer, attribute))
+            for attribute
+            in input_transformer.context_attributes
+        )
+        previous = self._manifest.load(self.input_type, self.output_type)
+        entries = {}
+        output_containers = []
+        for container in containers:
+            fingerprint = self._manifest.fingerprint(container, context)
+            entry = entries.get(fingerprint) or previous.get(fingerprint)
+            if entry is None:
+                entry = self._convert_entry(input_transformer, container)
+
+            previous_transformer = self._output_class()
+            for attribute, value in entry['state'].items():
+                setattr(previous_transformer, attribute, value)
+            output_transformer.merge(previous_transformer)
+
+            self.messages.update(entry['messages'])
+            output_containers.append(entry['container'])
+            entries[fingerprint] = entry
+
+        self._manifest.save(self.input_type, self.output_type, entries)
+        return output_containers
 
+    def _convert_entry(self, input_transformer, container):
+        chunk_transformer, chunk_converter, validated = self._convert_chunk(
+            input_transformer, [container])
+        self.stats.merge(chunk_converter.stats)
+
+        # Round trip through JSON so new entries match those loaded from the
+        # manifest
+        return json.loads(json.dumps({
+            'container': validated[0],
+            'messages': sorted(chunk_converter.messages),
+            'state': dict(
+                (attribute, getattr(chunk_transformer, attribute))
+                for attribute
+                in chunk_transformer.state_attributes
+            ),
+        }))
+
+    def convert_outputs(self, output_types, verbose=True, jobs=1):
+        """
+        Convert to several output types, reading and ingesting the input only
+        once. ``self.output_type`` is not used, and may be ``None``.
+
+        .. code-block:: python
+
+            converter = Converter('./docker-compose.yml', 'compose', None)
+            outputs = converter.convert_outputs(['ecs', 'kubernetes', 'systemd'])
+            print(outputs['ecs'])
+
+        :param output_types: The output formats
+        :type output_types: list of str
+        :param verbose: Print out newlines and indented output
+        :type verbose: bool
+        :param jobs: The number of worker processes to emit the outputs with.
+            ``1`` emits each output in turn in the current process, ``None``
+            uses the number of CPUs.
+        :type jobs: int
+
+        :rtype: dict
+        :returns: The output for each output type
+        """
+        input_transformer = self._read(self._filename)
+
+        # Ingesting into the base schema is done once for every output, so it
+        # is part of the ingest stage
+        start = time.perf_counter()
+        containers = input_transformer.ingest_containers()
+        ingest_plan = [
+            (parameter, input_name, getattr(input_transformer, 'ingest_{}'.format(parameter)))
+            for parameter, input_name
+            in compile_ingest_plan(self.input_type)
+        ]
+        ingested = []
         for container in containers:
-            converted_container = self._convert_container(
-                container,
-                input_transformer,
-                output_transformer
+            base = Container()
+            for parameter, input_name, ingest_func in ingest_plan:
+                value = container.get(input_name)
+                if value:
+                    setattr(base, parameter, ingest_func(value))
+            ingested.append((container, base))
+        self.stats.add('ingest', time.perf_counter() - start)
+        self.stats.containers += len(ingested)
+
+        if jobs == 1:
+            results = [
+                _emit_output(self.input_type, output_type, ingested, verbose)
+                for output_type
+                in output_types
+            ]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(
+                    _emit_output,
+                    *zip(*[
+                        (self.input_type, output_type, ingested, verbose)
+                        for output_type
+                        in output_types
+                    ])
+                ))
+
+        outputs = {}
+        for output_type, output, messages, stats in results:
+            outputs[output_type] = output
+            self.messages.update(messages)
+            self.stats.merge(stats)
+        return outputs
+
+    def _emit_ingested(self, ingested, verbose):
+        """
+        Emit containers that were already ingested into the base schema. The
+        containers are counted by ``convert_outputs()``, not here.
+
+        :param ingested: The input containers and their base schema values
+        :type ingested: list of tuple of (dict, container_transform.transformer.Container)
+
+        :rtype: str
+        """
+        output_transformer = self._output_class()
+
+        plan = [
+            (
+                input_name,
+                output_name,
+                required,
+                parameter,
+                getattr(output_transformer, 'emit_{}'.format(parameter)) if parameter else None,
             )
+            for parameter, input_name, output_name, required
+            in compile_plan(self.input_type, self.output_type)
+        ]
+
+        stats = self.stats
+        output_containers = []
+        for container, base in ingested:
+            start = time.perf_counter()
+            converted = {}
+            for input_name, output_name, required, parameter, emit_func in plan:
+                if container.get(input_name):
+                    if emit_func:
+                        converted[output_name] = emit_func(getattr(base, parameter))
+                elif required:
+                    self._add_missing_message(container, output_name)
+            converted_at = time.perf_counter()
+            stats.add('convert', converted_at - start)
+            stats.parameters += len(converted)
+
+            output_containers.append(output_transformer.validate(converted))
+            stats.add('validate', time.perf_counter() - converted_at)
+
+        return self._emit(output_transformer, output_containers, verbose)
+
+    def _convert_containers(self, input_transformer, output_transformer):
+        """
+        Convert and validate each ingested container
+
+        :rtype: generator of dict
+        """
+        start = time.perf_counter()
+        containers = input_transformer.ingest_containers()
+        self.stats.add('ingest', time.perf_counter() - start)
+
+        return self._convert_ingested(containers, input_transformer, output_transformer)
+
+    def _convert_lazily(self, input_transformer, output_transformer):
+        """
+        Ingest, convert and validate one container at a time
+
+        :rtype: generator of dict
+        """
+        containers = self._timed('ingest', input_transformer.iter_containers())
+        return self._convert_ingested(containers, input_transformer, output_transformer)
+
+    def _timed(self, stage, iterable):
+        """
+        Yield from ``iterable``, adding the time spent producing each item to
+        ``stage``
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.stats.add(stage, time.perf_counter() - start)
+            yield item
+
+    def _convert_ingested(self, containers, input_transformer, output_transformer):
+        """
+        Convert and validate each container
+
+        :rtype: generator of dict
+        """
+        stats = self.stats
+
+        plan = self._bind_plan(input_transformer, output_transformer)
+
+        for container in containers:
+            start = time.perf_counter()
+            converted_container = self._convert_container(container, plan)
+            converted = time.perf_counter()
+            stats.add('convert', converted - start)
+            stats.containers += 1
+            stats.parameters += len(converted_container)
 
             validated = output_transformer.validate(converted_container)
+            stats.add('validate', time.perf_counter() - converted)
 
-            output_containers.append(validated)
+            yield validated
 
-        return output_transformer.emit_containers(output_containers, verbose)
+    @staticmethod
+    def convert_many(filenames, input_type, output_type, verbose=True, jobs=None):
+        """
+        Convert many files in a pool of worker processes. Results are yielded
+        as each file finishes, so they may not be in the order given.
 
-    def _convert_container(self, container, input_transformer, output_transformer):
+        .. code-block:: python
+
+            for result in Converter.convert_many(files, 'compose', 'ecs', jobs=4):
+                if result.error:
+                    print(result.filename, result.error)
+
+        :param filenames: The files to be loaded
+        :type filenames: list of str
+        :param input_type: The input format of every file
+        :type input_type: str
+        :param output_type: The output format for every file
+        :type output_type: str
+        :param verbose: Print out newlines and indented output
+        :type verbose: bool
+        :param jobs: The number of worker processes. Defaults to the number of
+            CPUs, ``1`` converts in the current process.
+        :type jobs: int
+
+        :rtype: generator of ConversionResult
+        """
+        if jobs == 1:
+            for filename in filenames:
+                yield _convert_file(filename, input_type, output_type, verbose)
+            return
+
+        # Imported here as multiprocessing is slow to import and most
+        # conversions don't need it
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(_convert_file, filename, input_type, output_type, verbose)
+                for filename
+                in filenames
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _bind_plan(self, input_transformer, output_transformer):
+        """
+        Bind the compiled plan for this input/output pair to the transformer
+        instances
+
+        :rtype: list of tuple
+        :return: ``(input_name, output_name, required, ingest, emit)`` steps
+        """
+        bound = []
+        for parameter, input_name, output_name, required in compile_plan(
+                self.input_type, self.output_type):
+            ingest_func, emit_func = None, None
+            if parameter:
+                ingest_func = getattr(input_transformer, 'ingest_{}'.format(parameter))
+                emit_func = getattr(output_transformer, 'emit_{}'.format(parameter))
+            bound.append((input_name, output_name, required, ingest_func, emit_func))
+        return bound
+
+    def _convert_container(self, container, plan):
         """
         Converts a given dictionary to an output container definition
 
         :type container: dict
         :param container: The container definitions as a dictionary
+        :type plan: list of tuple
+        :param plan: The bound conversion plan from ``self._bind_plan()``
 
         :rtype: dict
         :return: A output_type container definition
         """
         output = {}
-        for parameter, options in ARG_MAP.items():
-            output_name = options.get(self.output_type, {}).get('name')
-            output_required = options.get(self.output_type, {}).get('required')
+        for input_name, output_name, required, ingest_func, emit_func in plan:
+            value = container.get(input_name)
 
-            input_name = options.get(self.input_type, {}).get('name')
-
-            if container.get(input_name) and \
-                    hasattr(input_transformer, 'ingest_{}'.format(parameter)) and \
-                    output_name and hasattr(output_transformer, 'emit_{}'.format(parameter)):
-                # call transform_{}
-                ingest_func = getattr(input_transformer, 'ingest_{}'.format(parameter))
-                emit_func = getattr(output_transformer, 'emit_{}'.format(parameter))
-
-                output[output_name] = emit_func(ingest_func(container.get(input_name)))
-
-            if not container.get(input_name) and output_required:
-                msg_template = 'Container {name} is missing required parameter "{output_name}".'
-                self.messages.add(
-                    msg_template.format(
-                        output_name=output_name,
-                        output_type=self.output_type,
-                        name=container.get('name', container)
-                    )
-                )
+            if value:
+                if ingest_func:
+                    output[output_name] = emit_func(ingest_func(value))
+            elif required:
+                self._add_missing_message(container, output_name)
 
         return output
+
+    def _add_missing_message(self, container, output_name):
+        msg_template = 'Container {name} is missing required parameter "{output_name}".'
+        self.messages.add(
+            msg_template.format(
+                output_name=output_name,
+                output_type=self.output_type,
+                name=container.get('name', container)
+            )
+        )
@@ -4,7 +4,8 @@ from copy import copy
 import shlex
 
 from .schema import TransformationTypes
-from .transformer import BaseTransformer
+from .serialization import dump_json, load_json
+from .transformer import BaseTransformer, Logging, PortMapping, Volume
 
 
 class ECSTransformer(BaseTransformer):
@@ -21,6 +22,8 @@ class ECSTransformer(BaseTransformer):
 
     """
     input_type = TransformationTypes.COMPOSE.value
+    context_attributes = ('volumes_in',)
+    state_attributes = ('volumes',)
 
     def __init__(self, filename=None):
         """
@@ -38,6 +41,8 @@ class ECSTransformer(BaseTransformer):
         self.volumes_in = volumes_in
 
         self.volumes = []
+        # The task volumes keyed by source path
+        self._volume_index = {}
 
     def _read_stream(self, stream):
         """
@@ -52,8 +57,14 @@ class ECSTransformer(BaseTransformer):
         :rtype: tuple of (str, list of dict, list of dict)
 
         """
-        contents = json.load(stream)
+        return self._read_data(load_json(stream))
 
+    def _read_data(self, contents):
+        """
+        :param contents: The parsed task definition, or list of containers
+        :type contents: dict or list
+        :rtype: tuple of (str, list of dict, list of dict)
+        """
         family, containers, volumes = '', contents, []
 
         if isinstance(contents, dict) and 'containerDefinitions' in contents.keys():
@@ -69,12 +80,37 @@ class ECSTransformer(BaseTransformer):
 
     def add_volume(self, volume):
         """
-        Add a volume to self.volumes if it isn't already present
+        Add a volume to self.volumes if there isn't already one with the same
+        source path
+
+        :param volume: A task volume
+        :type volume: dict
+        :returns: The task volume for the source path
+        :rtype: dict
         """
-        for old_vol in self.volumes:
-            if volume == old_vol:
-                return
+        if len(self._volume_index) != len(self.volumes):
+            # self.volumes was set directly, such as from a manifest
+            self._volume_index = dict(
+                (self._volume_source_path(old_vol), old_vol) for old_vol in self.volumes)
+
+        source_path = self._volume_source_path(volume)
+        existing = self._volume_index.get(source_path)
+        if existing is not None:
+            return existing
+        self._volume_index[source_path] = volume
         self.volumes.append(volume)
+        return volume
+
+    @staticmethod
+    def _volume_source_path(volume):
+        return (volume.get('host') or {}).get('sourcePath')
+
+    def merge(self, other):
+        """
+        Add the task volumes found by another instance
+        """
+        for volume in other.volumes:
+            self.add_volume(volume)
 
     def emit_containers(self, containers, verbose=True):
         """
@@ -89,16 +125,61 @@ class ECSTransformer(BaseTransformer):
         :returns: The text output
         :rtype: str
         """
+        task_definition = self.emit_document(containers)
+        if verbose:
+            return dump_json(task_definition, indent=4, sort_keys=True)
+        else:
+            return dump_json(task_definition)
+
+    def write_containers(self, containers, stream, verbose=True):
+        """
+        Writes the task definition to ``stream``, encoding it a piece at a
+        time. Only the converted containers are buffered, to sort them and
+        collect the task volumes.
+        """
+        if verbose:
+            encoder = json.JSONEncoder(indent=4, sort_keys=True)
+        else:
+            encoder = json.JSONEncoder()
+        for chunk in encoder.iterencode(self.emit_document(containers)):
+            stream.write(chunk)
+
+    def emit_document(self, containers):
+        """
+        Builds the task definition and sorts containers by name
+
+        :param containers: The container definitions
+        :type containers: iterable of dict
+
+        :rtype: dict
+        """
         containers = sorted(containers, key=lambda c: c.get('name'))
-        task_definition = {
+        return {
             'family': self.family,
             'containerDefinitions': containers,
             'volumes': self.volumes or []
         }
-        if verbose:
-            return json.dumps(task_definition, indent=4, sort_keys=True)
-        else:
-            return json.dumps(task_definition)
+
+    def stream_containers(self, containers, stream):
+        """
+        Writes each container definition as a ``{"container": {...}}`` line of
+        compact JSON. The task volumes are only known once every container is
+        emitted, so if there are any they follow as a final
+        ``{"task": {"family": ..., "volumes": [...]}}`` line.
+
+        :param containers: The container definitions
+        :type containers: iterable of dict
+
+        :param stream: A writable file-like object
+        :type stream: file
+        """
+        for container in containers:
+            stream.write(dump_json({'container': container}, sort_keys=True))
+            stream.write('\n')
+        if self.volumes:
+            task = {'family': self.family, 'volumes': self.volumes}
+            stream.write(dump_json({'task': task}, sort_keys=True))
+            stream.write('\n')
 
     @staticmethod
     def validate(container):
@@ -113,15 +194,11 @@ class ECSTransformer(BaseTransformer):
 
     @staticmethod
     def _parse_port_mapping(mapping):
-        output = {
-            'container_port': int(mapping['containerPort']),
-            'protocol': mapping.get('protocol', 'tcp')
-        }
-        host_port = mapping.get('hostPort')
-        if host_port:
-            output['host_port'] = host_port
-
-        return output
+        return PortMapping(
+            container_port=int(mapping['containerPort']),
+            protocol=mapping.get('protocol', 'tcp'),
+            host_port=mapping.get('hostPort') or None,
+        )
 
     def ingest_port_mappings(self, port_mappings):
         """
@@ -130,23 +207,24 @@ class ECSTransformer(BaseTransformer):
         :param port_mappings: The ECS port mappings
         :type port_mappings: list of dict
         :return: The base schema mappings
-        :rtype: list of dict
+        :rtype: list of PortMapping
         """
         return [self._parse_port_mapping(mapping) for mapping in port_mappings]
 
     @staticmethod
     def _emit_mapping(mapping):
+        mapping = PortMapping.from_value(mapping)
         output = {}
-        if 'host_port' not in mapping:
+        if mapping.host_port is None:
             output.update({
-                'containerPort': int(mapping.get('container_port')),
+                'containerPort': int(mapping.container_port),
             })
         else:
             output.update({
-                'hostPort': int(mapping['host_port']),
-                'containerPort': int(mapping['container_port']),
+                'hostPort': int(mapping.host_port),
+                'containerPort': int(mapping.container_port),
             })
-        if mapping.get('protocol') == 'udp':
+        if mapping.protocol == 'udp':
             output['protocol'] = 'udp'
         return output
 
@@ -233,12 +311,12 @@ class ECSTransformer(BaseTransformer):
         return data
 
     def _ingest_volume(self, volume):
-        data = {
-            'host': self.volumes_in.get(volume.get('sourceVolume')).get('path'),
-            'container': volume.get('containerPath'),
-            'readonly': self.volumes_in.get(volume.get('sourceVolume')).get('readonly')
-        }
-        return data
+        source = self.volumes_in.get(volume.get('sourceVolume'))
+        return Volume(
+            host=source.get('path'),
+            container=volume.get('containerPath'),
+            readonly=source.get('readonly'),
+        )
 
     def ingest_volumes(self, volumes):
         return [self._ingest_volume(volume) for volume in volumes]
@@ -248,7 +326,8 @@ class ECSTransformer(BaseTransformer):
         return path.replace('/', ' ').title().replace(' ', '').replace('.', '_')
 
     def _build_volume(self, volume):
-        host_path = volume.get('host')
+        volume = Volume.from_value(volume)
+        host_path = volume.host
         return {
             'name': self.path_to_name(host_path),
             'host': {
@@ -260,19 +339,17 @@ class ECSTransformer(BaseTransformer):
         """
         Given a generic volume definition, create the mountPoints element
         """
-        self.add_volume(self._build_volume(volume))
+        volume = Volume.from_value(volume)
+        task_volume = self._volume_index.get(volume.host)
+        if task_volume is None:
+            task_volume = self.add_volume(self._build_volume(volume))
         return {
-            'sourceVolume': self.path_to_name(volume.get('host')),
-            'containerPath': volume.get('container')
+            'sourceVolume': task_volume['name'],
+            'containerPath': volume.container
         }
 
     def emit_volumes(self, volumes):
-        return [
-            self._build_mountpoint(volume)
-            for volume
-            in volumes
-            if self._build_mountpoint(volume) is not None
-        ]
+        return [self._build_mountpoint(volume) for volume in volumes]
 
     def ingest_labels(self, labels):
         return labels
@@ -281,15 +358,20 @@ class ECSTransformer(BaseTransformer):
         return labels
 
     def ingest_logging(self, logging):
-        data = logging
-        if data.get('logDriver'):  # pragma: no cover
-            data['driver'] = data.get('logDriver')
-            del data['logDriver']
-        return logging
+        extra = dict(
+            (key, value)
+            for key, value
+            in logging.items()
+            if key not in ('logDriver', 'options')
+        )
+        return Logging(
+            driver=logging.get('logDriver'), options=logging.get('options'), extra=extra or None)
 
     def emit_logging(self, logging):
-        data = logging
-        if data.get('driver'):  # pragma: no cover
-            data['logDriver'] = data.get('driver')
-            del data['driver']
-        return logging
+        logging = Logging.from_value(logging)
+        data = dict(logging.extra or {})
+        if logging.options is not None:
+            data['options'] = logging.options
+        if logging.driver:
+            data['logDriver'] = logging.driver
+        return data
@@ -1,38 +1,9 @@
-import json
 import shlex
 
-from copy import deepcopy
-from functools import reduce
-from collections import Mapping, defaultdict
-
-import yaml
-
-from .schema import TransformationTypes, ARG_MAP
-from .transformer import BaseTransformer
-
-
-def update_nested_dict(d, u):
-    for k, v in u.items():
-        if isinstance(v, Mapping):
-            r = update_nested_dict(d.get(k, {}), v)
-            d[k] = r
-        elif isinstance(v, list):
-            if not d.get(k):
-                d[k] = v
-            else:
-                d[k] += v
-        else:
-            d[k] = u[k]
-    return d
-
-
-def lookup_nested_dict(dic, key, *keys):
-    if keys and dic:
-        return lookup_nested_dict(dic.get(key, None), *keys)
-    if dic:
-        return dic.get(key)
-    else:
-        return None
+from .paths import compile_paths, split_dotted_keys
+from .schema import TransformationTypes
+from .serialization import yaml_backend
+from .transformer import BaseTransformer, PortMapping, Volume
 
 
 class KubernetesTransformer(BaseTransformer):
@@ -43,6 +14,8 @@ class KubernetesTransformer(BaseTransformer):
 
     """
     input_type = TransformationTypes.COMPOSE.value
+    context_attributes = ('volumes_in',)
+    state_attributes = ('volumes',)
 
     pod_types = {
         'ReplicaSet': lambda x: x.get('spec').get('template').get('spec'),
@@ -69,26 +42,81 @@ class KubernetesTransformer(BaseTransformer):
 
     def _find_convertable_object(self, data):
         """
-        Get the first instance of a `self.pod_types`
+        Get the first instance of a `self.pod_types`, parsing only the
+        documents up to it
         """
-        data = list(data)
-        convertable_object_idxs = [
-            idx
-            for idx, obj
-            in enumerate(data)
-            if obj.get('kind') in self.pod_types.keys()
-        ]
-        if len(convertable_object_idxs) < 1:
-            raise Exception("Kubernetes config didn't contain any of {}".format(
-                ', '.join(self.pod_types.keys())
-            ))
-        return list(data)[convertable_object_idxs[0]]
+        for obj in self._iter_workloads(data):
+            return obj
+        raise Exception("Kubernetes config didn't contain any of {}".format(
+            ', '.join(self.pod_types.keys())
+        ))
+
+    @classmethod
+    def iter_workloads(cls, source):
+        """
+        Yield every object of one of the ``pod_types`` in ``source``, each
+        as soon as its document is parsed, so a large bundle of manifests is
+        never held in memory at once. Items of a ``List``, or of a typed list
+        such as a ``DeploymentList``, are yielded in order too.
+
+        .. code-block:: python
+
+            for workload in KubernetesTransformer.iter_workloads('./bundle.yaml'):
+                print(workload['metadata']['name'])
+
+        :param source: The file to be loaded, an open file-like object, or
+            the already parsed documents
+        :type source: str or file or dict or list
+
+        :rtype: generator of dict
+        """
+        if isinstance(source, (dict, list)):
+            yield from cls._iter_workloads([source] if isinstance(source, dict) else source)
+        elif hasattr(source, 'read'):
+            yield from cls._iter_workloads(yaml_backend().load_all(source))
+        else:
+            with open(source, 'r') as stream:
+                yield from cls._iter_workloads(yaml_backend().load_all(stream))
+
+    @classmethod
+    def _iter_workloads(cls, documents):
+        """
+        :param documents: The parsed documents
+        :type documents: iterable of dict
+
+        :rtype: generator of dict
+        """
+        for obj in documents:
+            if not isinstance(obj, dict):
+                # Such as the empty document after a trailing ---
+                continue
+            kind = obj.get('kind')
+            if not isinstance(kind, str):
+                continue
+            if kind in cls.pod_types:
+                yield obj
+            elif kind.endswith('List'):
+                # The items of a typed list, such as a DeploymentList, may
+                # leave out their kind
+                item_kind = kind[:-len('List')]
+                for item in obj.get('items') or []:
+                    if item_kind and isinstance(item, dict) and 'kind' not in item:
+                        item = dict(item, kind=item_kind)
+                    yield from cls._iter_workloads([item])
 
     def _read_stream(self, stream):
         """
         Read in the pod stream
         """
-        data = yaml.safe_load_all(stream=stream)
+        return self._read_data(yaml_backend().load_all(stream))
+
+    def _read_data(self, data):
+        """
+        :param data: The parsed documents, or a single document
+        :type data: iterable of dict or dict
+        """
+        if isinstance(data, dict):
+            data = [data]
         obj = self._find_convertable_object(data)
         pod = self.pod_types[obj['kind']](obj)
         return obj, pod.get('containers'), self.ingest_volumes_param(pod.get('volumes', []))
@@ -111,12 +139,11 @@ class KubernetesTransformer(BaseTransformer):
         return data
 
     def _ingest_volume(self, volume):
-        data = {
-            'host': self.volumes_in.get(volume.get('name')).get('path', ''),
-            'container': volume.get('mountPath', ''),
-            'readonly': bool(volume.get('readOnly')),
-        }
-        return data
+        return Volume(
+            host=self.volumes_in.get(volume.get('name')).get('path', ''),
+            container=volume.get('mountPath', ''),
+            readonly=bool(volume.get('readOnly')),
+        )
 
     def ingest_volumes(self, volumes):
         return [self._ingest_volume(volume) for volume in volumes]
@@ -125,25 +152,28 @@ class KubernetesTransformer(BaseTransformer):
         """
         Accepts a kubernetes container and pulls out the nested values into the top level
         """
-        for names in ARG_MAP.values():
-            if names[TransformationTypes.KUBERNETES.value]['name'] and \
-                            '.' in names[TransformationTypes.KUBERNETES.value]['name']:
-                kubernetes_dotted_name = names[TransformationTypes.KUBERNETES.value]['name']
-                parts = kubernetes_dotted_name.split('.')
-                result = lookup_nested_dict(container, *parts)
-                if result:
-                    container[kubernetes_dotted_name] = result
+        for path, _ in compile_paths(TransformationTypes.KUBERNETES.value):
+            result = path.get(container)
+            if result:
+                container[path.name] = result
         return container
 
     def ingest_containers(self, containers=None):
+        return list(self.iter_containers(containers))
+
+    def iter_containers(self, containers=None):
         containers = containers or self.stream or {}
         # Accept groups api output
         if isinstance(containers, dict):
             containers = [containers]
-        return [
-            self.flatten_container(container)
-            for container
-            in containers]
+        for container in containers:
+            yield self.flatten_container(container)
+
+    def merge(self, other):
+        """
+        Add the pod volumes found by another instance
+        """
+        self.volumes.update(other.volumes)
 
     def emit_containers(self, containers, verbose=True):
         """
@@ -158,6 +188,28 @@ class KubernetesTransformer(BaseTransformer):
         :returns: The text output
         :rtype: str
         """
+        return self._dump(self.emit_document(containers))
+
+    def write_containers(self, containers, stream, verbose=True):
+        """
+        Writes the Deployment to ``stream``. Only the converted containers are
+        buffered, to sort them by name.
+        """
+        self._dump(self.emit_document(containers), stream)
+
+    @staticmethod
+    def _dump(output, stream=None):
+        return yaml_backend().dump(output, stream)
+
+    def emit_document(self, containers):
+        """
+        Builds a Deployment of the containers, sorted by name
+
+        :param containers: The container definitions
+        :type containers: iterable of dict
+
+        :rtype: dict
+        """
         containers = sorted(containers, key=lambda c: c.get('name'))
 
         output = {
@@ -187,7 +239,7 @@ class KubernetesTransformer(BaseTransformer):
                         }
                     },
                     'spec': {
-                        'containers': json.loads(json.dumps(containers))
+                        'containers': containers
                     }
                 }
             }
@@ -195,47 +247,28 @@ class KubernetesTransformer(BaseTransformer):
         if self.volumes:
             volumes = sorted(self.volumes.values(), key=lambda x: x.get('name'))
             output['spec']['template']['spec']['volumes'] = volumes
-
-        noalias_dumper = yaml.dumper.SafeDumper
-        noalias_dumper.ignore_aliases = lambda self, data: True
-        return yaml.dump(
-            output,
-            default_flow_style=False,
-            Dumper=noalias_dumper
-        )
+        return output
 
     def validate(self, container):
         # Ensure container name
         # container_name = container.get('name', str(uuid.uuid4()))
         # container['name'] = container_name
 
-        container_data = defaultdict(lambda: defaultdict(dict))
-        container_data.update(container)
-
-        # Find keys with periods in the name, these are keys that we delete and
-        # create the corresponding entry for
-        for key, value in deepcopy(container_data).items():
-            if key and '.' in key:
-                parts = key.split('.')
-                data = reduce(lambda x, y: {y: x}, reversed(parts + [value]))
-                update_nested_dict(container_data, data)
-                del container_data[key]
+        # The nested dicts follow the other keys
+        container_data, nested = split_dotted_keys(container)
+        container_data.update(nested)
 
         return container_data
 
     @staticmethod
     def _parse_port_mapping(mapping):
-        output = {
-            'container_port': int(mapping['containerPort']),
-            'protocol': mapping.get('protocol', 'TCP').lower(),
-        }
-        if 'hostPort' in mapping:
-            output['host_port'] = int(mapping.get('hostPort'))
-        if 'name' in mapping:
-            output['name'] = mapping.get('name')
-        if 'hostIP' in mapping:
-            output['host_ip'] = mapping.get('hostIP')
-        return output
+        return PortMapping(
+            container_port=int(mapping['containerPort']),
+            protocol=mapping.get('protocol', 'TCP').lower(),
+            host_port=int(mapping['hostPort']) if 'hostPort' in mapping else None,
+            name=mapping.get('name'),
+            host_ip=mapping.get('hostIP'),
+        )
 
     def ingest_port_mappings(self, port_mappings):
         """
@@ -244,23 +277,24 @@ class KubernetesTransformer(BaseTransformer):
         :param port_mappings: The port mappings
         :type port_mappings: list of dict
         :return: The base schema mappings
-        :rtype: list of dict
+        :rtype: list of PortMapping
         """
         return [self._parse_port_mapping(mapping) for mapping in port_mappings]
 
     def emit_port_mappings(self, port_mappings):
         output = []
         for mapping in port_mappings:
+            mapping = PortMapping.from_value(mapping)
             data = {
-                'containerPort': mapping['container_port'],
-                'protocol': mapping.get('protocol', 'tcp').upper()
+                'containerPort': mapping.container_port,
+                'protocol': (mapping.protocol or 'tcp').upper()
             }
-            if mapping.get('host_port'):
-                data['hostPort'] = mapping['host_port']
-            if mapping.get('host_ip'):
-                data['hostIP'] = mapping['host_ip']
-            if mapping.get('name'):
-                data['name'] = mapping['name']
+            if mapping.host_port:
+                data['hostPort'] = mapping.host_port
+            if mapping.host_ip:
+                data['hostIP'] = mapping.host_ip
+            if mapping.name:
+                data['name'] = mapping.name
             output.append(data)
         return output
 
@@ -353,19 +387,20 @@ class KubernetesTransformer(BaseTransformer):
         """
         Given a generic volume definition, create the volumes element
         """
-        self.volumes[self._build_volume_name(volume.get('host'))] = {
-            'name': self._build_volume_name(volume.get('host')),
+        volume = Volume.from_value(volume)
+        self.volumes[self._build_volume_name(volume.host)] = {
+            'name': self._build_volume_name(volume.host),
             'hostPath': {
-                'path': volume.get('host')
+                'path': volume.host
             }
         }
         response = {
-            'name': self._build_volume_name(volume.get('host')),
-            'mountPath': volume.get('container'),
+            'name': self._build_volume_name(volume.host),
+            'mountPath': volume.container,
 
         }
-        if volume.get('readonly', False):
-            response['readOnly'] = bool(volume.get('readonly', False))
+        if volume.readonly:
+            response['readOnly'] = True
         return response
 
     def emit_volumes(self, volumes):
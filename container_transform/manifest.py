@@ -0,0 +1,95 @@
+import os
+import json
+import hashlib
+import tempfile
+
+from .version import __version__
+
+
+class FingerprintManifest(object):
+    """
+    A manifest of the fingerprint of each service's ingested definition,
+    along with its converted output, kept beside the output file.
+
+    When the input is converted again, services with an unchanged fingerprint
+    reuse their previous output instead of being converted, so the time to
+    reconvert depends on the number of changed services rather than the size
+    of the input. The output is still emitted in full.
+
+    To use this class:
+
+    .. code-block:: python
+
+        manifest = FingerprintManifest('./task-definition.json.manifest')
+        converter = Converter('./docker-compose.yml', 'compose', 'ecs', manifest=manifest)
+        output = converter.convert()
+
+    """
+
+    def __init__(self, path):
+        """
+        :param path: The manifest file, created on the first conversion
+        :type path: str
+        """
+        self.path = os.path.expanduser(path)
+
+    @staticmethod
+    def fingerprint(container, context=None):
+        """
+        :param container: An ingested container
+        :type container: dict
+        :param context: Any input level data the container's conversion
+            depends on, such as the volumes of an ECS task
+        :type context: dict
+
+        :rtype: str
+        """
+        data = json.dumps([container, context], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def load(self, input_type, output_type):
+        """
+        Read the entries of a previous conversion between the same types with
+        the same version, keyed by fingerprint
+
+        :rtype: dict
+        """
+        try:
+            with open(self.path, 'r') as stream:
+                manifest = json.load(stream)
+        except (OSError, ValueError):
+            return {}
+
+        if manifest.get('header') != self._header(input_type, output_type):
+            return {}
+        return manifest.get('services', {})
+
+    def save(self, input_type, output_type, entries):
+        """
+        Replace the manifest with the entries of the current conversion
+
+        :param entries: Each entry has the converted ``container``, its
+            ``messages`` and the output transformer ``state``, keyed by
+            fingerprint
+        :type entries: dict
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as stream:
+                json.dump({
+                    'header': self._header(input_type, output_type),
+                    'services': entries,
+                }, stream)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _header(input_type, output_type):
+        return {
+            'version': __version__,
+            'input_type': input_type,
+            'output_type': output_type,
+        }
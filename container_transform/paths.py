@@ -0,0 +1,172 @@
+from functools import lru_cache
+
+from .schema import ARG_MAP
+
+
+class DottedPath(object):
+    """
+    A dotted ``ARG_MAP`` name, such as ``container.docker.image``, split once
+    into the keys of the nested dicts it names.
+
+    Names under ``parameters``, such as ``container.docker.parameters.user``,
+    name an item of the docker parameters list rather than a nested key.
+    Their ``parameter`` is the docker option, and ``parameters`` is the path
+    of the list itself.
+    """
+    __slots__ = ('name', 'keys', 'parents', 'key', 'parameter', 'parameters')
+
+    def __init__(self, name):
+        """
+        :param name: The dotted name
+        :type name: str
+        """
+        self.name = name
+        self.keys = tuple(name.split('.'))
+        self.parents = self.keys[:-1]
+        self.key = self.keys[-1]
+
+        self.parameter, self.parameters = None, None
+        if len(self.keys) > 1 and self.keys[-2] == 'parameters':
+            self.parameter = self.key
+            self.parameters = compile_path(name.rpartition('.')[0])
+
+    def get(self, data):
+        """
+        :param data: The nested dicts
+        :type data: dict
+
+        :returns: The value, or ``None`` when any of the keys is missing
+        """
+        for key in self.keys:
+            if not data:
+                return None
+            data = data.get(key)
+        return data
+
+    def set(self, data, value):
+        """
+        Set the value, creating any missing parent dicts. A list is added to
+        any list that is already there, so several names can fill one list.
+
+        :param data: The nested dicts
+        :type data: dict
+        """
+        for key in self.parents:
+            child = data.get(key)
+            if child is None:
+                child = data[key] = {}
+            data = child
+
+        if isinstance(value, list) and data.get(self.key):
+            data[self.key] += value
+        else:
+            data[self.key] = value
+
+    def __repr__(self):
+        return 'DottedPath({!r})'.format(self.name)
+
+
+class ParameterIndex(object):
+    """
+    The values of a docker parameters list, such as
+    ``container.docker.parameters``, grouped by key in one pass so that each
+    lookup doesn't scan the whole list.
+
+    ``log-opt`` is a sub option of ``log-driver``, so a lookup of
+    ``log-driver`` gets the whole ``log-driver`` and ``log-opt`` parameters,
+    in order, for ``ingest_logging()`` to split.
+    """
+    __slots__ = ('values', 'logging')
+
+    def __init__(self, parameters):
+        """
+        :param parameters: The ``{'key': ..., 'value': ...}`` parameters
+        :type parameters: list of dict
+        """
+        self.values, self.logging = {}, []
+        for parameter in parameters or ():
+            key = parameter['key']
+            if key in ('log-driver', 'log-opt'):
+                self.logging.append(parameter)
+            if 'value' not in parameter:
+                # Such as a bare flag, which has no value to look up
+                continue
+            values = self.values.get(key)
+            if values is None:
+                self.values[key] = [parameter['value']]
+            else:
+                values.append(parameter['value'])
+
+    def lookup(self, key, common_type=None):
+        """
+        :param key: The docker option
+        :type key: str
+        :param common_type: The ``ARG_MAP`` type of the value. Every value of
+            a ``list`` is returned, otherwise only the first.
+
+        :returns: The value, or ``None`` when there isn't a parameter for
+            ``key``
+        """
+        if key == 'log-driver':
+            return self.logging
+
+        values = self.values.get(key)
+        if values:
+            if common_type == list:
+                return values
+            return values[0]
+
+
+@lru_cache(maxsize=None)
+def compile_path(name):
+    """
+    :param name: The dotted name
+    :type name: str
+    :rtype: DottedPath
+    """
+    return DottedPath(name)
+
+
+def split_dotted_keys(container):
+    """
+    Split the keys with periods in the name from the other keys of a
+    container, setting their values in nested dicts instead. The docker
+    parameters of every name are added to a copy of the first list.
+
+    :param container: A converted container
+    :type container: dict
+    :rtype: tuple of (dict, dict)
+    :returns: The other keys, and the nested dicts
+    """
+    container_data, nested = {}, {}
+    for key, value in container.items():
+        if key and '.' in key:
+            path = compile_path(key)
+            if path.parameter:
+                path.parameters.set(nested, list(value))
+            else:
+                path.set(nested, value)
+        else:
+            container_data[key] = value
+    return container_data, nested
+
+
+@lru_cache(maxsize=None)
+def compile_paths(transformation_type):
+    """
+    Compile the dotted ``ARG_MAP`` names of a format
+
+    :param transformation_type: The format
+    :type transformation_type: str
+    :rtype: tuple of tuple
+    :returns: ``(path, common_type)`` for each dotted name, where
+        ``common_type`` is the ``ARG_MAP`` type of the value, if any
+    """
+    return tuple(
+        (compile_path(options[transformation_type]['name']),
+         options[transformation_type].get('type'))
+        for options
+        in ARG_MAP.values()
+        if options.get(transformation_type, {}).get('name') and
+        '.' in options[transformation_type]['name']
+    )
@@ -0,0 +1,290 @@
+import os
+import re
+import json
+from functools import lru_cache
+
+
+class StdlibJSONBackend(object):
+    """
+    Reads and writes JSON with the standard library
+    """
+    name = 'json'
+
+    def loads(self, data):
+        """
+        :param data: A JSON document
+        :type data: str
+        """
+        return json.loads(data)
+
+    def dumps(self, obj, indent=None, sort_keys=False):
+        """
+        :param obj: The document to write
+        :param indent: Spaces to indent each level by, or ``None`` for
+            compact output
+        :type indent: int
+        :param sort_keys: Sort the keys of objects
+        :type sort_keys: bool
+
+        :rtype: str
+        """
+        return json.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+
+# A float at the end of a line of indented output. Strings always end with a
+# quote, so a digit before the end of a line is part of a number.
+FLOAT_END = re.compile(rb'[0-9](?:\.[0-9]+(?:e[-+]?[0-9]+)?|e[-+]?[0-9]+)(?=,?\n|,?$)')
+# Characters that json.dumps() escapes with ensure_ascii, which are only ever
+# in strings
+NON_ASCII_BYTES = re.compile(rb'[\x7f-\xff]')
+NON_ASCII = re.compile('[^\x00-\x7e]')
+
+
+class OrjsonJSONBackend(StdlibJSONBackend):
+    """
+    Writes indented JSON with orjson, falling back to the standard library
+    for anything orjson doesn't support, such as integers over 64 bits.
+
+    JSON is still read by the standard library. orjson reads integers over 64
+    bits as floats, and finding them in the text first costs more than
+    orjson saves.
+
+    Indented output is adjusted to be the same as ``json.dumps()``: orjson
+    only indents by two spaces, writes floats in its own format, and doesn't
+    escape non-ASCII characters. Compact output is written by the standard
+    library, whose C encoder is as fast as orjson once the spacing is
+    adjusted. The one difference is ``NaN`` and infinite floats, which aren't
+    JSON and are written as ``null`` by orjson.
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj, indent=None, sort_keys=False):
+        if indent is None or indent < 2:
+            return super(OrjsonJSONBackend, self).dumps(obj, indent, sort_keys)
+
+        option = self._orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= self._orjson.OPT_SORT_KEYS
+        try:
+            data = self._orjson.dumps(obj, option=option)
+        except self._orjson.JSONEncodeError:
+            return super(OrjsonJSONBackend, self).dumps(obj, indent, sort_keys)
+
+        data = self._reindent(self._format_floats(data), indent)
+        if NON_ASCII_BYTES.search(data):
+            return NON_ASCII.sub(
+                lambda match: json.dumps(match.group())[1:-1], data.decode('utf-8'))
+        return data.decode('utf-8')
+
+    @staticmethod
+    def _format_floats(data):
+        """
+        Rewrite each float as ``repr()`` does, as json.dumps() does
+        """
+        pieces, end = [], 0
+        for match in FLOAT_END.finditer(data):
+            # Numbers follow the indentation or a key's ': '
+            start = data.rfind(b' ', end, match.start()) + 1 or end
+            pieces.append(data[end:start])
+            pieces.append(repr(float(data[start:match.end()])).encode('ascii'))
+            end = match.end()
+        if not pieces:
+            return data
+        pieces.append(data[end:])
+        return b''.join(pieces)
+
+    @staticmethod
+    def _reindent(data, indent):
+        """
+        Indent each level by ``indent`` spaces rather than two
+        """
+        # Each pass indents every line at ``depth`` or deeper by the extra
+        # spaces of one level. Lines are never indented inside strings.
+        depth = 1
+        while True:
+            old = b'\n' + b' ' * (indent * (depth - 1) + 2)
+            if old not in data:
+                return data
+            data = data.replace(old, b'\n' + b' ' * (indent * depth))
+            depth += 1
+
+
+JSON_BACKENDS = {
+    StdlibJSONBackend.name: StdlibJSONBackend,
+    OrjsonJSONBackend.name: OrjsonJSONBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def json_backend(name=None):
+    """
+    Get a JSON backend. By default this is the one named by the
+    ``CT_JSON_BACKEND`` environment variable, or the standard library. orjson
+    is only used when it is asked for, as it is not faster for every output.
+
+    :param name: One of ``JSON_BACKENDS``
+    :type name: str
+    :rtype: StdlibJSONBackend
+    """
+    name = name or os.environ.get('CT_JSON_BACKEND') or StdlibJSONBackend.name
+    return JSON_BACKENDS[name]()
+
+
+def load_json(stream):
+    """
+    :param stream: A readable file-like object
+    :type stream: file
+    """
+    data = stream.read()
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json_backend().loads(data)
+
+
+def dump_json(obj, indent=None, sort_keys=False):
+    """
+    :rtype: str
+    """
+    return json_backend().dumps(obj, indent, sort_keys)
+
+
+class PyYAMLBackend(object):
+    """
+    Reads and writes YAML with PyYAML's pure Python parser and emitter.
+    Aliases are never written, so repeated values are written in full.
+    """
+    name = 'yaml'
+
+    def __init__(self):
+        import yaml
+        self._yaml = yaml
+        self.loader = yaml.SafeLoader
+        self.dumper = self._no_alias_dumper(yaml.SafeDumper)
+
+    def load(self, stream):
+        """
+        :param stream: A YAML document, or a readable file-like object
+        :type stream: file
+        """
+        return self._yaml.load(stream, Loader=self.loader)
+
+    def load_all(self, stream):
+        """
+        :param stream: YAML documents, or a readable file-like object
+        :type stream: file
+        :rtype: generator of the documents, parsed as they are read
+        """
+        return self._yaml.load_all(stream, Loader=self.loader)
+
+    def dump(self, data, stream=None):
+        """
+        :param data: The document to write
+        :param stream: A writable file-like object
+        :type stream: file
+
+        :returns: The document when ``stream`` is ``None``
+        :rtype: str
+        """
+        return self._yaml.dump(
+            data,
+            stream,
+            default_flow_style=False,
+            Dumper=self.dumper
+        )
+
+    @staticmethod
+    def _no_alias_dumper(dumper):
+        return type('NoAlias' + dumper.__name__, (dumper,), {
+            'ignore_aliases': lambda self, data: True,
+        })
+
+
+# Mapping keys that the pure Python emitter writes as ``? key``, which
+# libyaml writes as ``key:``
+LONG_KEY = 100
+
+
+class LibYAMLBackend(PyYAMLBackend):
+    """
+    Reads and writes YAML with the libyaml C bindings of PyYAML, which are
+    many times faster than the pure Python parser and emitter.
+
+    Documents are parsed the same, since only the parser is in C. The
+    emitters only differ in how they fold long quoted strings, write empty or
+    long keys and end a document that is a single value, so those documents
+    are written by the pure Python emitter.
+    """
+    name = 'libyaml'
+
+    def __init__(self):
+        super(LibYAMLBackend, self).__init__()
+        if not self._yaml.__with_libyaml__:
+            raise ImportError('PyYAML was built without libyaml')
+        self.loader = self._yaml.CSafeLoader
+        self.c_dumper = self._no_alias_dumper(self._yaml.CSafeDumper)
+
+    def dump(self, data, stream=None):
+        if not self._emits_identically(data):
+            return super(LibYAMLBackend, self).dump(data, stream)
+        return self._yaml.dump(
+            data,
+            stream,
+            default_flow_style=False,
+            Dumper=self.c_dumper
+        )
+
+    @staticmethod
+    def _emits_identically(data):
+        """
+        :returns: Whether libyaml writes ``data`` the same as the pure Python
+            emitter
+        :rtype: bool
+        """
+        if not isinstance(data, (dict, list)):
+            return False
+
+        pending = [data]
+        while pending:
+            value = pending.pop()
+            if isinstance(value, str):
+                if not (value.isascii() and value.isprintable()):
+                    return False
+            elif isinstance(value, dict):
+                for key in value:
+                    if isinstance(key, str) and not 0 < len(key) <= LONG_KEY:
+                        return False
+                pending.extend(value)
+                pending.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                pending.extend(value)
+        return True
+
+
+YAML_BACKENDS = {
+    PyYAMLBackend.name: PyYAMLBackend,
+    LibYAMLBackend.name: LibYAMLBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def yaml_backend(name=None):
+    """
+    Get a YAML backend. By default this is the one named by the
+    ``CT_YAML_BACKEND`` environment variable, or libyaml where PyYAML was
+    built with it and pure Python otherwise.
+
+    :param name: One of ``YAML_BACKENDS``
+    :type name: str
+    :rtype: PyYAMLBackend
+    """
+    name = name or os.environ.get('CT_YAML_BACKEND')
+    if name:
+        return YAML_BACKENDS[name]()
+    try:
+        return LibYAMLBackend()
+    except ImportError:
+        return PyYAMLBackend()
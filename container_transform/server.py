@@ -0,0 +1,133 @@
+import io
+import json
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+
+from .converter import Converter
+from .schema import InputTransformationTypes, OutputTransformationTypes
+
+
+INPUT_TYPES = set(v.value for v in InputTransformationTypes)
+OUTPUT_TYPES = set(v.value for v in OutputTransformationTypes)
+
+
+class ConversionError(Exception):
+    """
+    A request that could not be converted, with the HTTP status to return
+    """
+
+    def __init__(self, status, message):
+        super(ConversionError, self).__init__(message)
+        self.status = status
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """
+    Converts documents sent as JSON in a ``POST`` body:
+
+    .. code-block:: json
+
+        {"input_type": "compose", "output_type": "ecs", "document": "...", "verbose": true}
+
+    and responds with the output, any messages and the conversion time:
+
+    .. code-block:: json
+
+        {"output": "...", "messages": [], "elapsed_ms": 1.7}
+
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        start = time.perf_counter()
+        try:
+            output, messages = self._convert(self._read_request())
+        except ConversionError as e:
+            status, body = e.status, {'error': str(e)}
+        else:
+            status, body = 200, {'output': output, 'messages': sorted(messages)}
+
+        body['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        self._respond(status, body)
+
+    def _read_request(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The body can't be read, so the connection can't be reused
+            self.close_connection = True
+            raise ConversionError(400, 'Invalid Content-Length header')
+        try:
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError as e:
+            raise ConversionError(400, 'Invalid JSON request: {}'.format(e))
+        if not isinstance(request, dict) or not isinstance(request.get('document'), str):
+            raise ConversionError(400, 'Request must contain a "document" string')
+
+        if request.get('input_type') not in INPUT_TYPES:
+            raise ConversionError(400, 'Unknown input_type {!r}'.format(request.get('input_type')))
+        if request.get('output_type') not in OUTPUT_TYPES:
+            raise ConversionError(
+                400, 'Unknown output_type {!r}'.format(request.get('output_type')))
+        return request
+
+    @staticmethod
+    def _convert(request):
+        converter = Converter(
+            io.StringIO(request['document']),
+            request['input_type'],
+            request['output_type'],
+        )
+        try:
+            output = converter.convert(request.get('verbose', True))
+        except Exception as e:
+            raise ConversionError(422, '{}: {}'.format(type(e).__name__, e))
+        return output, converter.messages
+
+    def _respond(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.log_message('"%s" %s %.3fms', self.requestline, status, body['elapsed_ms'])
+
+    def log_request(self, code='-', size='-'):
+        # Requests are logged with their latency in self._respond()
+        pass
+
+    def address_string(self):
+        # Unix socket clients don't have an address
+        return self.client_address[0] if self.client_address else 'unix'
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(host='127.0.0.1', port=8080, socket_path=None):
+    """
+    Create a conversion server on a localhost TCP port, or on a unix socket if
+    ``socket_path`` is given. The transformers stay imported and the
+    conversion plans stay compiled between requests.
+
+    :param host: The address to listen on
+    :type host: str
+    :param port: The port to listen on, ``0`` picks a free port
+    :type port: int
+    :param socket_path: The unix socket to listen on
+    :type socket_path: str
+
+    :rtype: socketserver.BaseServer
+    """
+    if socket_path:
+        return ThreadingUnixHTTPServer(socket_path, ConversionRequestHandler)
+    return ThreadingHTTPServer((host, port), ConversionRequestHandler)
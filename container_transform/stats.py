@@ -0,0 +1,69 @@
+STAGES = ('read', 'ingest', 'convert', 'validate', 'emit')
+
+
+class ConversionStats(object):
+    """
+    Wall time and call counts for each stage of a conversion, plus the number
+    of containers and parameters converted.
+
+    The stages are:
+
+    * ``read``: loading and parsing the input
+    * ``ingest``: ``ingest_containers()`` on the input transformer
+    * ``convert``: mapping each container's parameters to the output format
+    * ``validate``: ``validate()`` on the output transformer
+    * ``emit``: ``emit_containers()``, ``stream_containers()`` or
+      ``write_containers()`` on the output transformer
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.containers = 0
+        self.parameters = 0
+
+    def add(self, stage, seconds):
+        """
+        :param stage: One of ``STAGES``
+        :type stage: str
+        :param seconds: The wall time spent in one call of the stage
+        :type seconds: float
+        """
+        self.seconds[stage] += seconds
+        self.calls[stage] += 1
+
+    def merge(self, other):
+        """
+        Add the stats from another conversion, such as one chunk of a
+        parallel conversion
+
+        :type other: ConversionStats
+        """
+        for stage in STAGES:
+            self.seconds[stage] += other.seconds[stage]
+            self.calls[stage] += other.calls[stage]
+        self.containers += other.containers
+        self.parameters += other.parameters
+
+    def as_dict(self):
+        """
+        :rtype: dict
+        """
+        return {
+            'stages': dict(
+                (stage, {'seconds': self.seconds[stage], 'calls': self.calls[stage]})
+                for stage
+                in STAGES
+            ),
+            'containers': self.containers,
+            'parameters': self.parameters,
+        }
+
+    def __str__(self):
+        lines = ['{:<10}{:>8}{:>12}'.format('stage', 'calls', 'seconds')]
+        for stage in STAGES:
+            lines.append('{:<10}{:>8}{:>12.6f}'.format(
+                stage, self.calls[stage], self.seconds[stage]))
+        lines.append('{:<10}{:>8}'.format('containers', self.containers))
+        lines.append('{:<10}{:>8}'.format('parameters', self.parameters))
+        return '\n'.join(lines)
@@ -1,6 +1,9 @@
-from jinja2 import Template
+import os
+import tempfile
 
-from .transformer import BaseTransformer
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+from .transformer import BaseTransformer, Logging, PortMapping, Volume
 
 
 UNIT_TEMPLATE = '''\
@@ -63,6 +66,51 @@ ExecStart=/usr/bin/docker run \\
     {{ command }}{% endif %}
 ExecStop=/usr/bin/docker stop {{ name }}
 '''
+UNIT_TEMPLATE_NAME = 'unit.service'
+
+
+class _BytecodeCache(FileSystemBytecodeCache):
+    """
+    A ``FileSystemBytecodeCache`` that creates its directory when the
+    template is first compiled, and compiles without a cache if the directory
+    can't be read or written
+    """
+
+    def load_bytecode(self, bucket):
+        try:
+            super(_BytecodeCache, self).load_bytecode(bucket)
+        except OSError:
+            pass
+
+    def dump_bytecode(self, bucket):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            super(_BytecodeCache, self).dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+def _bytecode_cache():
+    """
+    Keep the compiled template in the directory named by the
+    ``CT_TEMPLATE_CACHE_DIR`` environment variable, if it is set, so new
+    processes don't compile it again
+
+    :rtype: FileSystemBytecodeCache or None
+    """
+    directory = os.environ.get('CT_TEMPLATE_CACHE_DIR')
+    if not directory:
+        return None
+    return _BytecodeCache(os.path.expanduser(directory))
+
+
+# The template is compiled on first use and kept by the environment for the
+# life of the process. It never changes, so it isn't checked for changes.
+ENVIRONMENT = Environment(
+    loader=DictLoader({UNIT_TEMPLATE_NAME: UNIT_TEMPLATE}),
+    auto_reload=False,
+    bytecode_cache=_bytecode_cache(),
+)
 
 
 class SystemdTransformer(BaseTransformer):
@@ -84,12 +132,106 @@ class SystemdTransformer(BaseTransformer):
         pass
 
     def emit_containers(self, containers, verbose=True):
-        units = []
+        return '\n'.join(self.emit_document(containers))
+
+    def write_containers(self, containers, stream, verbose=True):
+        """
+        Writes each unit to ``stream`` as soon as its container is converted
+        """
+        for idx, unit in enumerate(self._render_units(containers)):
+            if idx:
+                stream.write('\n')
+            stream.write(unit)
+
+    def emit_document(self, containers):
+        """
+        Renders a unit for each container
+
+        :param containers: List of the container definitions
+        :type containers: list of dict
+
+        :rtype: list of str
+        """
+        return list(self._render_units(containers))
+
+    def write_units(self, containers, directory, workers=None):
+        """
+        Writes each unit to ``<directory>/<name>.service``, rendering and
+        writing the units in a pool of ``workers`` threads. Each file is
+        replaced atomically, and only when its content changed, so unchanged
+        units keep their modification time. Units of any other services in
+        ``directory`` are left alone.
+
+        .. code-block:: python
+
+            converter = Converter('./docker-compose.yml', 'compose', 'systemd', workers=4)
+            converter.write_units('/etc/systemd/system')
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        template = ENVIRONMENT.get_template(UNIT_TEMPLATE_NAME)
+
+        def write_unit(container):
+            return self._write_unit(directory, self._render_unit(template, container), container)
+
+        if not workers or workers == 1:
+            return dict(write_unit(container) for container in self._unique_units(containers))
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(executor.map(write_unit, self._unique_units(containers)))
+
+    @staticmethod
+    def _unique_units(containers):
+        """
+        Only keep the last container of each name, as a single conversion
+        does, so no two threads write the same file
+        """
+        units = {}
         for container in containers:
-            link_keys = [link.split(':')[0] for link in container.get('links', [])]
-            container['link_keys'] = link_keys
-            units.append(Template(UNIT_TEMPLATE).render(container))
-        return '\n'.join(units)
+            name = container.get('name')
+            if not name or os.sep in str(name) or name in (os.curdir, os.pardir):
+                raise ValueError('{!r} is not a valid unit name'.format(name))
+            units.pop(name, None)
+            units[name] = container
+        return list(units.values())
+
+    @staticmethod
+    def _write_unit(directory, unit, container):
+        """
+        :returns: The path of the unit file, and whether it was written
+        :rtype: tuple of (str, bool)
+        """
+        path = os.path.join(directory, '{}.service'.format(container.get('name')))
+        try:
+            with open(path, 'r') as stream:
+                if stream.read() == unit:
+                    return path, False
+        except OSError:
+            pass
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as stream:
+                stream.write(unit)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return path, True
+
+    @classmethod
+    def _render_units(cls, containers):
+        template = ENVIRONMENT.get_template(UNIT_TEMPLATE_NAME)
+        for container in containers:
+            yield cls._render_unit(template, container)
+
+    @staticmethod
+    def _render_unit(template, container):
+        link_keys = [link.split(':')[0] for link in container.get('links', [])]
+        return template.render(container, link_keys=link_keys)
 
     @staticmethod
     def validate(container):
@@ -100,24 +242,21 @@ class SystemdTransformer(BaseTransformer):
 
     @staticmethod
     def _emit_mapping(mapping):
-        parts = []
-        if mapping.get('host_ip'):
-            parts.append(str(mapping['host_ip']))
-        if mapping.get('host_port'):
-            parts.append(str(mapping['host_port']))
-        if mapping.get('container_ip'):
-            parts.append(str(mapping['container_ip']))
-        if mapping.get('container_port'):
-            parts.append(str(mapping['container_port']))
-        output = ':'.join(parts)
-        if mapping.get('protocol') == 'udp':
+        mapping = PortMapping.from_value(mapping)
+        output = ':'.join(
+            str(part)
+            for part
+            in (mapping.host_ip, mapping.host_port, mapping.container_ip, mapping.container_port)
+            if part
+        )
+        if mapping.protocol == 'udp':
             output += '/udp'
         return output
 
     def emit_port_mappings(self, port_mappings):
         """
         :param port_mappings: the base schema port_mappings
-        :type port_mappings: list of dict
+        :type port_mappings: list of PortMapping
         :return:
         :rtype: list of str
         """
@@ -164,20 +303,18 @@ class SystemdTransformer(BaseTransformer):
 
     @staticmethod
     def _emit_volume(volume):
-        volume_str = volume.get('host') + ':' + volume.get('container', ':')
+        volume = Volume.from_value(volume)
+        container = ':' if volume.container is None else volume.container
+        volume_str = volume.host + ':' + container
         volume_str = volume_str.strip(':')
 
-        if volume.get('readonly') and len(volume_str):
+        if volume.readonly and len(volume_str):
             volume_str += ':ro'
         return volume_str
 
     def emit_volumes(self, volumes):
-        return [
-            self._emit_volume(volume)
-            for volume
-            in volumes
-            if len(self._emit_volume(volume))
-        ]
+        emitted = (self._emit_volume(volume) for volume in volumes)
+        return [volume_str for volume_str in emitted if len(volume_str)]
 
     def ingest_labels(self, labels):
         pass
@@ -189,4 +326,4 @@ class SystemdTransformer(BaseTransformer):
         pass
 
     def emit_logging(self, logging):
-        return logging
+        return Logging.from_value(logging).as_dict()
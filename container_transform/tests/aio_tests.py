@@ -0,0 +1,85 @@
+import asyncio
+from unittest import TestCase
+
+from container_transform.aio import ConversionPool
+from container_transform.converter import Converter
+
+
+class AsyncConversionTests(TestCase):
+    """
+    Tests for Converter.aconvert() and the ConversionPool
+    """
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _services(self, count):
+        return {
+            'version': '2',
+            'services': dict(
+                ('web{}'.format(idx), {'image': 'nginx', 'ports': ['{}:80'.format(8000 + idx)]})
+                for idx in range(count)
+            ),
+        }
+
+    def test_aconvert(self):
+        filename = './container_transform/tests/docker-compose.yml'
+
+        for output_type in ('ecs', 'kubernetes', 'marathon', 'systemd'):
+            for verbose in (True, False):
+                conv = Converter(filename, 'compose', output_type, chunk_size=2)
+                output = self.loop.run_until_complete(conv.aconvert(verbose))
+
+                single = Converter(filename, 'compose', output_type)
+                self.assertEqual(output, single.convert(verbose))
+                self.assertEqual(conv.messages, single.messages)
+                self.assertEqual(conv.stats.containers, single.stats.containers)
+                self.assertEqual(conv.stats.calls['emit'], 1)
+
+    def test_aconvert_cancel(self):
+        conv = Converter(self._services(20), 'compose', 'ecs', chunk_size=1)
+        convert_chunk = conv._convert_chunk
+        chunks = []
+
+        def cancel_after_first_chunk(*args):
+            chunks.append(args)
+            if len(chunks) == 1:
+                self.loop.call_soon_threadsafe(task.cancel)
+            return convert_chunk(*args)
+
+        conv._convert_chunk = cancel_after_first_chunk
+        task = self.loop.create_task(conv.aconvert())
+
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(task)
+        self.assertLess(len(chunks), 20)
+        self.assertEqual(conv.stats.calls['emit'], 0)
+
+    def test_pool_limit(self):
+        pool = ConversionPool(limit=2)
+        running = []
+        peak = []
+
+        class SlowConverter(Converter):
+            async def aconvert(self, verbose=True, executor=None):
+                running.append(self)
+                peak.append(len(running))
+                await asyncio.sleep(0.01)
+                output = await super(SlowConverter, self).aconvert(verbose, executor)
+                running.remove(self)
+                return output
+
+        async def convert_all():
+            return await asyncio.gather(*[
+                pool.convert(SlowConverter(self._services(3), 'compose', 'ecs'), False)
+                for _ in range(6)
+            ])
+
+        outputs = self.loop.run_until_complete(convert_all())
+
+        self.assertEqual(max(peak), 2)
+        expected = Converter(self._services(3), 'compose', 'ecs').convert(False)
+        self.assertEqual(outputs, [expected] * 6)
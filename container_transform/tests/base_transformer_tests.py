@@ -1,6 +1,7 @@
+import pickle
 from unittest import TestCase
 
-from container_transform.transformer import BaseTransformer
+from container_transform.transformer import BaseTransformer, Container, PortMapping, Volume
 from container_transform.schema import ARG_MAP
 
 
@@ -30,3 +31,38 @@ class BaseTransformerTests(TestCase):
             available_params.difference(ingest_methods),
             {'build', 'essential', 'volumes_from', 'logging'}
         )
+
+
+class RecordTests(TestCase):
+    """
+    Tests for the base schema records
+    """
+
+    def test_container_has_all_parameters(self):
+        self.assertEqual(set(Container.__slots__), set(ARG_MAP.keys()))
+
+    def test_record_reads_like_dict(self):
+        mapping = PortMapping(container_port=53, host_port=0, protocol='udp')
+
+        self.assertEqual(mapping, {'container_port': 53, 'host_port': 0, 'protocol': 'udp'})
+        self.assertEqual(mapping['host_port'], 0)
+        self.assertIn('host_port', mapping)
+        self.assertNotIn('host_ip', mapping)
+        self.assertEqual(mapping.get('host_ip', '0.0.0.0'), '0.0.0.0')
+        with self.assertRaises(KeyError):
+            mapping['host_ip']
+        self.assertNotEqual(mapping, PortMapping(container_port=53))
+
+    def test_record_from_value(self):
+        volume = Volume(host='/data', container='/var/lib/data')
+
+        self.assertIs(Volume.from_value(volume), volume)
+        self.assertEqual(Volume.from_value({'host': '/data', 'container': '/var/lib/data'}), volume)
+        with self.assertRaises(TypeError):
+            Volume.from_value({'host': '/data', 'mode': 'RO'})
+
+    def test_record_pickle(self):
+        volume = Volume(host='/data', container='/var/lib/data', readonly=True)
+
+        self.assertEqual(pickle.loads(pickle.dumps(volume)), volume)
+        self.assertFalse(hasattr(volume, '__dict__'))
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import patch
+
+from container_transform.cache import ConversionCache
+from container_transform.converter import Converter
+
+
+class ConversionCacheTests(TestCase):
+    """
+    Tests for the ConversionCache
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ConversionCache(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_key(self):
+        key = self.cache.key(b'web:\n  image: nginx\n', 'compose', 'ecs', True)
+
+        self.assertEqual(key, self.cache.key(b'web:\n  image: nginx\n', 'compose', 'ecs', True))
+        self.assertNotEqual(key, self.cache.key(b'web:\n  image: nginx\n', 'compose', 'ecs', False))
+        self.assertNotEqual(key, self.cache.key(b'web:\n  image: nginx\n', 'compose', 'k8s', True))
+        self.assertNotEqual(key, self.cache.key(b'web:\n  image: redis\n', 'compose', 'ecs', True))
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('missing'))
+
+        self.cache.set('abc', '{}', {'a message'})
+
+        self.assertEqual(self.cache.get('abc'), ('{}', {'a message'}))
+
+    def test_set_failed(self):
+        with patch('os.replace', side_effect=OSError('No space left on device')):
+            with self.assertRaises(OSError):
+                self.cache.set('abc', '{}', set())
+
+        # The temporary file is removed
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_evict_least_recently_used(self):
+        self.cache.max_size = 3 * len('{"output": "x", "messages": []}')
+
+        for idx, key in enumerate(['a', 'b', 'c']):
+            self.cache.set(key, 'x', set())
+            os.utime(os.path.join(self.directory, '{}.json'.format(key)), (idx, idx))
+
+        # Reading 'a' makes 'b' the least recently used entry
+        self.cache.get('a')
+        self.cache.set('d', 'x', set())
+
+        self.assertIsNone(self.cache.get('b'))
+        for key in ['a', 'c', 'd']:
+            self.assertEqual(self.cache.get(key), ('x', set()))
+
+    def test_converter_cache_hit(self):
+        filename = './container_transform/tests/docker-compose.yml'
+
+        conv = Converter(filename, 'compose', 'ecs', cache=self.cache)
+        output = conv.convert()
+
+        cached_conv = Converter(filename, 'compose', 'ecs', cache=self.cache)
+        with patch.object(cached_conv, '_convert') as mock_convert:
+            self.assertEqual(cached_conv.convert(), output)
+            self.assertFalse(mock_convert.called)
+        self.assertEqual(cached_conv.messages, conv.messages)
@@ -4,6 +4,7 @@ from unittest import TestCase
 
 
 from click.testing import CliRunner
+from mock import patch
 
 from container_transform.client import transform
 
@@ -350,3 +351,247 @@ class ClientTests(TestCase):
             result.output,
             service_contents
         )
+
+    def test_prompt_compose_cache_dir(self):
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with open('docker-compose.yml', 'w') as f:
+                f.write(self.yaml_input)
+
+            result = runner.invoke(
+                transform, ['docker-compose.yml', '--cache-dir', 'cache', '--no-verbose'])
+            assert result.exit_code == 0
+            self.assertEqual(len(os.listdir('cache')), 1)
+
+            cached_result = runner.invoke(
+                transform, ['docker-compose.yml', '--cache-dir', 'cache', '--no-verbose'])
+            assert cached_result.exit_code == 0
+            self.assertEqual(result.output, cached_result.output)
+
+            for options in (['--ndjson'], ['--output-dir', 'out'], ['--watch']):
+                result = runner.invoke(
+                    transform, ['docker-compose.yml', '--cache-dir', 'cache'] + options)
+                self.assertEqual(result.exit_code, 2)
+                self.assertIn('--cache-dir can not be used with', result.output)
+
+    def test_prompt_compose_manifest(self):
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with open('docker-compose.yml', 'w') as f:
+                f.write(self.yaml_input)
+
+            result = runner.invoke(
+                transform, ['docker-compose.yml', '--manifest', 'ecs.manifest', '--no-verbose'])
+            assert result.exit_code == 0
+            self.assertTrue(os.path.exists('ecs.manifest'))
+
+            again = runner.invoke(
+                transform, ['docker-compose.yml', '--manifest', 'ecs.manifest', '--no-verbose'])
+            assert again.exit_code == 0
+            self.assertEqual(result.output, again.output)
+
+            result = runner.invoke(
+                transform,
+                ['docker-compose.yml', '--manifest', 'ecs.manifest', '--output-dir', 'out'])
+            assert result.exit_code == 2
+
+    def test_prompt_compose_watch(self):
+        runner = CliRunner()
+        versions = [
+            b'web:\n  image: nginx\n',
+            b'web:\n  image: [nginx\n',
+            b'web:\n  image: httpd\n',
+        ]
+        with runner.isolated_filesystem():
+            with open('docker-compose.yml', 'w') as f:
+                f.write(self.yaml_input)
+
+            with patch('container_transform.watch.FileWatcher.changes', return_value=versions):
+                result = runner.invoke(
+                    transform, ['docker-compose.yml', '--watch', '--no-verbose', '-o', 'marathon'])
+
+        assert result.exit_code == 0
+        self.assertIn('Watching docker-compose.yml for changes', result.output)
+        self.assertIn('"image": "nginx"', result.output)
+        self.assertIn('ParserError', result.output)
+        self.assertIn('"image": "httpd"', result.output)
+
+        result = runner.invoke(transform, ['--watch'])
+        assert result.exit_code == 2
+
+    def test_prompt_compose_ndjson(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(
+            transform, [input_file, '-q', '-o', 'marathon', '--ndjson'])
+        assert result.exit_code == 0
+
+        lines = result.output.splitlines()
+        self.assertEqual(
+            [json.loads(line)['id'] for line in lines],
+            ['worker', 'db', 'redis', 'web', 'web2', 'logs', 'web3', 'web4', 'dummy'],
+        )
+
+    def test_prompt_compose_ndjson_ecs_volumes(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(transform, [input_file, '-q', '--ndjson'])
+        assert result.exit_code == 0
+
+        *containers, task = [json.loads(line) for line in result.output.splitlines()]
+        self.assertEqual(len(containers), 9)
+        for container in containers:
+            self.assertEqual(list(container), ['container'])
+            self.assertIn('name', container['container'])
+        self.assertEqual(list(task), ['task'])
+        self.assertIn('volumes', task['task'])
+        self.assertNotIn('containerDefinitions', task['task'])
+
+    def test_prompt_compose_ndjson_unsupported(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(
+            transform, [input_file, '-q', '-o', 'systemd', '--ndjson'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('--ndjson is not supported for output type systemd', result.output)
+
+    def test_prompt_compose_lazy(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        for output_type in ('ecs', 'systemd', 'kubernetes'):
+            result = runner.invoke(transform, [input_file, '-q', '-o', output_type, '--lazy'])
+            assert result.exit_code == 0
+
+            expected = runner.invoke(transform, [input_file, '-q', '-o', output_type])
+            self.assertEqual(result.output, expected.output)
+
+    def test_prompt_compose_lazy_ndjson(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(transform, [input_file, '--lazy', '--ndjson'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('--lazy can not be used with', result.output)
+
+    def test_prompt_compose_stats(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(transform, [input_file, '-q', '--stats'])
+        assert result.exit_code == 0
+
+        for stage in ['read', 'ingest', 'convert', 'validate', 'emit', 'containers']:
+            self.assertIn('\n{} '.format(stage), result.output)
+
+    def test_prompt_compose_output_dir(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        with runner.isolated_filesystem():
+            result = runner.invoke(
+                transform, [input_file, '-o', 'ecs,kubernetes,systemd', '--output-dir', 'out'])
+            assert result.exit_code == 0
+
+            self.assertEqual(
+                sorted(os.listdir('out')),
+                ['ecs.json', 'kubernetes.yaml', 'systemd.service']
+            )
+            self.assertIn('Wrote out/ecs.json', result.output)
+
+            single = runner.invoke(transform, [input_file, '-q', '-o', 'systemd'])
+            self.assertEqual(open('out/systemd.service').read(), single.output)
+
+    def test_prompt_compose_unit_dir(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        with runner.isolated_filesystem():
+            result = runner.invoke(
+                transform, [input_file, '-o', 'systemd', '--unit-dir', 'units', '-w', '2'])
+            assert result.exit_code == 0
+            self.assertIn('Wrote units/web.service', result.output)
+
+            units = sorted(os.listdir('units'))
+            single = runner.invoke(transform, [input_file, '-q', '-o', 'systemd'])
+            for unit in units:
+                self.assertIn(open(os.path.join('units', unit)).read(), single.output)
+            self.assertEqual(len(units), single.output.count('ExecStart='))
+
+            result = runner.invoke(transform, [input_file, '-o', 'systemd', '--unit-dir', 'units'])
+            assert result.exit_code == 0
+            self.assertNotIn('Wrote', result.output)
+            self.assertIn('{} unchanged'.format(len(units)), result.output)
+
+        result = runner.invoke(transform, [input_file, '-o', 'ecs', '--unit-dir', 'units'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('--unit-dir needs the systemd output type', result.output)
+
+        result = runner.invoke(
+            transform, [input_file, '-o', 'systemd', '--lazy', '--unit-dir', 'units'])
+        self.assertEqual(result.exit_code, 2)
+
+        for options in (['--manifest', 'ecs.manifest'], ['--ndjson'], ['--output-dir', 'out']):
+            result = runner.invoke(transform, [input_file, '-w', '2'] + options)
+            self.assertEqual(result.exit_code, 2)
+            self.assertIn('--workers can not be used with', result.output)
+
+        with runner.isolated_filesystem():
+            with open('docker-compose.yml', 'w') as stream:
+                stream.write('version: "2"\nservices:\n  "..":\n    image: nginx\n')
+            result = runner.invoke(
+                transform, ['docker-compose.yml', '-o', 'systemd', '--unit-dir', 'units'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn("'..' is not a valid unit name", result.output)
+
+    def test_prompt_kubernetes_workload_dir(self):
+        runner = CliRunner()
+        input_file = '{}/k8s_tests/kubernetes-dashboard.yaml'.format(os.path.dirname(__file__))
+
+        with runner.isolated_filesystem():
+            with open(input_file) as f:
+                bundle = f.read()
+            with open('bundle.yaml', 'w') as f:
+                f.write(bundle + '---\n' + bundle)
+
+            result = runner.invoke(
+                transform,
+                ['bundle.yaml', '-i', 'kubernetes', '-o', 'ecs', '--workload-dir', 'out'])
+            assert result.exit_code == 0
+            filename = 'out/kube-system-deployment-kubernetes-dashboard.json'
+            self.assertEqual(
+                sorted(os.listdir('out')),
+                ['kube-system-deployment-kubernetes-dashboard-2.json',
+                 'kube-system-deployment-kubernetes-dashboard.json']
+            )
+            self.assertIn('Wrote {}'.format(filename), result.output)
+
+            single = runner.invoke(transform, [input_file, '-q', '-i', 'kubernetes', '-o', 'ecs'])
+            self.assertEqual(open(filename).read(), single.output)
+
+            result = runner.invoke(
+                transform, [input_file, '-o', 'ecs', '--workload-dir', 'compose'])
+            self.assertEqual(result.exit_code, 2)
+            self.assertIn('--workload-dir is not supported for input type compose', result.output)
+            self.assertFalse(os.path.exists('compose'))
+
+        result = runner.invoke(
+            transform, [input_file, '-i', 'kubernetes', '--lazy', '--workload-dir', 'out'])
+        self.assertEqual(result.exit_code, 2)
+
+    def test_prompt_several_outputs_need_output_dir(self):
+        runner = CliRunner()
+        input_file = '{}/docker-compose.yml'.format(os.path.dirname(__file__))
+
+        result = runner.invoke(transform, [input_file, '-o', 'ecs,systemd'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('Several output types need an --output-dir', result.output)
+
+        result = runner.invoke(transform, [input_file, '-o', 'ecs,bogus', '--output-dir', 'out'])
+        self.assertEqual(result.exit_code, 2)
+
+        result = runner.invoke(transform, [input_file, '--ndjson', '--output-dir', 'out'])
+        self.assertEqual(result.exit_code, 2)
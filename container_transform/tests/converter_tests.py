@@ -1,7 +1,14 @@
+import os
+import sys
 import json
+import tempfile
+import subprocess
+from io import StringIO
 from unittest import TestCase
 
-from container_transform.converter import Converter
+import yaml
+
+from container_transform.converter import Converter, compile_plan
 
 
 class ConverterTests(TestCase):
@@ -91,3 +98,215 @@ class ConverterTests(TestCase):
 
         output_want = open(output_filename, 'r').read()
         self.assertEqual(output, output_want)
+
+    def test_compile_plan_cached(self):
+        plan = compile_plan('compose', 'ecs')
+
+        self.assertIs(plan, compile_plan('compose', 'ecs'))
+        self.assertIn(('image', 'image', 'image', True), plan)
+        # build has no ingest/emit methods, so it is dropped from the plan
+        self.assertNotIn('build', [step[0] for step in plan])
+
+    def test_convert_many(self):
+        filenames = [
+            './container_transform/tests/docker-compose.yml',
+            './container_transform/tests/composev2.yml',
+            './container_transform/tests/does-not-exist.yml',
+        ]
+
+        for jobs in (1, 2):
+            results = dict(
+                (result.filename, result)
+                for result
+                in Converter.convert_many(filenames, 'compose', 'ecs', jobs=jobs)
+            )
+
+            self.assertEqual(set(filenames), set(results.keys()))
+
+            good = results[filenames[1]]
+            self.assertIsNone(good.error)
+            self.assertEqual(
+                good.output,
+                Converter(filenames[1], 'compose', 'ecs').convert()
+            )
+
+            bad = results[filenames[2]]
+            self.assertIsNone(bad.output)
+            self.assertTrue(bad.error.startswith('FileNotFoundError'))
+
+    def test_transformers_imported_lazily(self):
+        script = (
+            'import sys\n'
+            'from container_transform.converter import Converter\n'
+            "Converter('./container_transform/tests/marathon-test.json', 'marathon', 'chronos')"
+            '.convert()\n'
+            "print(' '.join(sorted(m for m in ('yaml', 'jinja2') if m in sys.modules)))\n"
+        )
+        output = subprocess.check_output([sys.executable, '-c', script])
+        self.assertEqual(output.strip(), b'')
+
+    def test_converter_stats(self):
+        filename = './container_transform/tests/docker-compose.yml'
+        conv = Converter(filename, 'compose', 'ecs')
+        conv.convert()
+
+        stats = conv.stats.as_dict()
+        self.assertEqual(stats['containers'], 9)
+        self.assertGreater(stats['parameters'], 9)
+        self.assertEqual(stats['stages']['read']['calls'], 1)
+        self.assertEqual(stats['stages']['convert']['calls'], 9)
+        self.assertEqual(stats['stages']['validate']['calls'], 9)
+        self.assertEqual(stats['stages']['emit']['calls'], 1)
+        for stage in stats['stages'].values():
+            self.assertGreaterEqual(stage['seconds'], 0)
+
+        self.assertIn('containers       9', str(conv.stats))
+
+    def test_convert_parsed_input(self):
+        filename = './container_transform/tests/marathon-group.json'
+        group = json.load(open(filename))
+
+        conv = Converter(group, 'marathon', 'compose')
+
+        self.assertEqual(conv.convert(), Converter(filename, 'marathon', 'compose').convert())
+
+    def test_convert_stream_input(self):
+        filename = './container_transform/tests/composev2.yml'
+        conv = Converter(StringIO(open(filename).read()), 'compose', 'systemd')
+
+        self.assertEqual(conv.convert(), Converter(filename, 'compose', 'systemd').convert())
+
+    def test_convert_document(self):
+        filename = './container_transform/tests/composev2_extended.yml'
+        output_filename = './container_transform/tests/composev2_extended_output.json'
+        conv = Converter(filename, 'compose', 'ecs')
+
+        self.assertDictEqual(conv.convert_document(), json.load(open(output_filename)))
+
+    def test_convert_document_kubernetes_documents(self):
+        filename = './container_transform/tests/k8s_tests/dns.yaml'
+        documents = list(yaml.safe_load_all(open(filename)))
+        conv = Converter(documents, 'kubernetes', 'compose')
+
+        output = conv.convert_document()
+
+        self.assertEqual(
+            output,
+            yaml.safe_load(Converter(filename, 'kubernetes', 'compose').convert())
+        )
+
+    def test_convert_document_systemd(self):
+        filename = './container_transform/tests/composev2.yml'
+        units = Converter(filename, 'compose', 'systemd').convert_document()
+
+        self.assertEqual(len(units), 1)
+        self.assertTrue(units[0].startswith('# web.service'))
+
+    def test_convert_outputs(self):
+        filename = './container_transform/tests/composev2_extended.yml'
+        output_types = ['ecs', 'systemd', 'kubernetes', 'marathon']
+
+        for jobs in (1, 2):
+            conv = Converter(filename, 'compose', None)
+            outputs = conv.convert_outputs(output_types, jobs=jobs)
+
+            self.assertEqual(set(outputs.keys()), set(output_types))
+            for output_type in output_types:
+                single = Converter(filename, 'compose', output_type)
+                self.assertEqual(outputs[output_type], single.convert())
+                self.assertTrue(single.messages.issubset(conv.messages))
+            self.assertEqual(conv.stats.calls['read'], 1)
+            self.assertEqual(conv.stats.calls['ingest'], 1)
+            self.assertEqual(conv.stats.containers, single.stats.containers)
+            for stage in ('convert', 'validate'):
+                self.assertEqual(
+                    conv.stats.calls[stage], len(output_types) * conv.stats.containers)
+            self.assertEqual(conv.stats.calls['emit'], len(output_types))
+            self.assertGreater(conv.stats.parameters, conv.stats.containers)
+
+    def test_convert_workers(self):
+        filename = './container_transform/tests/docker-compose.yml'
+        services = dict(
+            ('web{}'.format(idx), {
+                'image': 'nginx:1.{}'.format(idx),
+                'mem_limit': '64m',
+                'ports': ['{}:80'.format(8000 + idx)],
+                'volumes': ['/srv/shared:/srv', '/srv/web{}:/data:ro'.format(idx)],
+            })
+            for idx in range(50)
+        )
+        inputs = [filename, {'version': '2', 'services': services}]
+
+        for data in inputs:
+            for output_type in ('ecs', 'kubernetes', 'marathon', 'systemd'):
+                serial = Converter(data, 'compose', output_type)
+                parallel = Converter(data, 'compose', output_type, workers=3, chunk_size=2)
+
+                self.assertEqual(parallel.convert(), serial.convert())
+                self.assertEqual(parallel.messages, serial.messages)
+                self.assertEqual(parallel.stats.containers, serial.stats.containers)
+
+    def test_write(self):
+        filename = './container_transform/tests/composev2_extended.yml'
+
+        for output_type in ('ecs', 'compose', 'systemd', 'marathon', 'chronos', 'kubernetes'):
+            for verbose in (True, False):
+                stream = StringIO()
+                conv = Converter(filename, 'compose', output_type)
+                conv.write(stream, verbose)
+
+                single = Converter(filename, 'compose', output_type)
+                expected = single.convert(verbose)
+                if output_type == 'chronos':
+                    # The schedule starts at the time of conversion
+                    self.assertEqual(len(stream.getvalue()), len(expected))
+                else:
+                    self.assertEqual(stream.getvalue(), expected)
+                self.assertEqual(conv.messages, single.messages)
+                self.assertEqual(conv.stats.containers, single.stats.containers)
+
+    def test_write_ingests_lazily(self):
+        filename = './container_transform/tests/docker-compose.yml'
+        conv = Converter(filename, 'compose', 'systemd')
+        conv.write(StringIO())
+
+        self.assertEqual(conv.stats.calls['ingest'], conv.stats.containers + 1)
+        self.assertEqual(conv.stats.calls['convert'], conv.stats.containers)
+
+    def test_write_units(self):
+        filename = './container_transform/tests/composev2_extended.yml'
+        expected = Converter(filename, 'compose', 'systemd').convert()
+
+        with tempfile.TemporaryDirectory() as directory:
+            conv = Converter(filename, 'compose', 'systemd', workers=2)
+            written = conv.write_units(directory)
+
+            self.assertTrue(all(written.values()))
+            self.assertEqual(sorted(written), sorted(
+                os.path.join(directory, unit) for unit in os.listdir(directory)))
+            self.assertEqual(conv.stats.containers, len(written))
+            for path in written:
+                self.assertIn(open(path).read(), expected)
+
+        with self.assertRaises(NotImplementedError):
+            Converter(filename, 'compose', 'ecs').write_units(directory)
+
+    def test_convert_workloads(self):
+        filename = './container_transform/tests/k8s_tests/dns.yaml'
+        documents = list(yaml.safe_load_all(open(filename)))
+        bundle = StringIO(yaml.safe_dump_all(documents + [{'kind': 'List', 'items': documents}]))
+
+        conv = Converter(bundle, 'kubernetes', 'compose')
+        results = list(conv.convert_workloads())
+
+        single = Converter(filename, 'kubernetes', 'compose')
+        expected = single.convert()
+        self.assertEqual(
+            [(workload['kind'], output) for workload, output in results],
+            [('ReplicationController', expected), ('ReplicationController', expected)]
+        )
+        self.assertEqual(conv.messages, single.messages)
+        self.assertEqual(conv.stats.containers, 2 * single.stats.containers)
+
+        with self.assertRaises(NotImplementedError):
+            list(Converter(filename, 'compose', 'ecs').convert_workloads())
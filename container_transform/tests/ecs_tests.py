@@ -1,8 +1,10 @@
+import json
 from unittest import TestCase
 
 from mock import patch
 import uuid
 
+from container_transform.converter import Converter
 from container_transform.ecs import ECSTransformer
 
 
@@ -68,3 +70,59 @@ class ECSTransformerTests(TestCase):
             self.transformer.emit_command(command),
             ["/bin/echo", "Hello world"]
         )
+
+    def test_emit_volumes(self):
+        volumes = [
+            {'host': '/var/lib/db', 'container': '/data'},
+            {'host': '/etc/app.conf', 'container': '/etc/app.conf', 'readonly': True},
+            {'host': '/var/lib/db', 'container': '/backup'},
+        ]
+
+        self.assertEqual(
+            self.transformer.emit_volumes(volumes),
+            [
+                {'sourceVolume': 'VarLibDb', 'containerPath': '/data'},
+                {'sourceVolume': 'EtcApp_Conf', 'containerPath': '/etc/app.conf'},
+                {'sourceVolume': 'VarLibDb', 'containerPath': '/backup'},
+            ]
+        )
+        self.assertEqual(
+            self.transformer.volumes,
+            [
+                {'name': 'VarLibDb', 'host': {'sourcePath': '/var/lib/db'}},
+                {'name': 'EtcApp_Conf', 'host': {'sourcePath': '/etc/app.conf'}},
+            ]
+        )
+
+    def test_add_volume(self):
+        volume = {'name': 'VarLibDb', 'host': {'sourcePath': '/var/lib/db'}}
+        other = ECSTransformer()
+        other.volumes = [dict(volume)]
+
+        self.transformer.add_volume(volume)
+        self.transformer.merge(other)
+        self.assertEqual(self.transformer.volumes, [volume])
+
+        # Volumes set directly are indexed on the next addition
+        other.emit_volumes([{'host': '/var/lib/db', 'container': '/data'}])
+        self.assertEqual(other.volumes, [volume])
+
+    def test_logging_secret_options(self):
+        logging = {
+            'logDriver': 'splunk',
+            'options': {'splunk-url': 'https://splunk.example.com'},
+            'secretOptions': [{'name': 'splunk-token', 'valueFrom': 'arn:aws:ssm:token'}],
+        }
+        task = {
+            'family': 'web',
+            'containerDefinitions': [
+                {'name': 'web', 'image': 'nginx', 'memory': 128, 'logConfiguration': logging},
+            ],
+        }
+
+        ingested = self.transformer.ingest_logging(logging)
+        self.assertEqual(ingested.extra, {'secretOptions': logging['secretOptions']})
+        self.assertEqual(self.transformer.emit_logging(ingested), logging)
+
+        output = json.loads(Converter(task, 'ecs', 'ecs').convert())
+        self.assertEqual(output['containerDefinitions'][0]['logConfiguration'], logging)
@@ -0,0 +1,90 @@
+from io import StringIO
+from unittest import TestCase
+
+from container_transform.kubernetes import KubernetesTransformer
+
+
+BUNDLE = '''\
+apiVersion: v1
+kind: Service
+metadata:
+  name: web
+---
+apiVersion: extensions/v1beta1
+kind: Deployment
+metadata:
+  name: web
+spec:
+  template:
+    spec:
+      containers:
+      - name: web
+        image: nginx
+---
+apiVersion: v1
+kind: List
+items:
+- apiVersion: v1
+  kind: Pod
+  metadata:
+    name: worker
+  spec:
+    containers:
+    - name: worker
+      image: me/worker
+- apiVersion: v1
+  kind: ConfigMap
+  metadata:
+    name: settings
+---
+apiVersion: extensions/v1beta1
+kind: DeploymentList
+items:
+- metadata:
+    name: db
+    namespace: data
+  spec:
+    template:
+      spec:
+        containers:
+        - name: db
+          image: postgres
+---
+'''
+
+
+class KubernetesTransformerTests(TestCase):
+    """
+    Tests for Kubernetes Transformer
+    """
+
+    def test_iter_workloads(self):
+        workloads = list(KubernetesTransformer.iter_workloads(StringIO(BUNDLE)))
+
+        self.assertEqual(
+            [(workload['kind'], workload['metadata']['name']) for workload in workloads],
+            [('Deployment', 'web'), ('Pod', 'worker'), ('Deployment', 'db')]
+        )
+
+    def test_iter_workloads_invalid_kind(self):
+        stream = StringIO('kind: [Pod]\n---\nkind: 1\n---\nkind:\n---\n' + BUNDLE)
+        workloads = list(KubernetesTransformer.iter_workloads(stream))
+
+        self.assertEqual(len(workloads), 3)
+
+    def test_iter_workloads_lazily(self):
+        stream = StringIO(BUNDLE + '[not yaml\n')
+        workloads = KubernetesTransformer.iter_workloads(stream)
+
+        # Only the documents up to each workload are parsed
+        self.assertEqual(next(workloads)['metadata']['name'], 'web')
+        self.assertEqual(next(workloads)['metadata']['name'], 'worker')
+
+    def test_read_first_workload(self):
+        transformer = KubernetesTransformer(StringIO(BUNDLE + '[not yaml\n'))
+
+        self.assertEqual(transformer.obj['metadata']['name'], 'web')
+        self.assertEqual(transformer.ingest_containers()[0]['image'], 'nginx')
+
+        with self.assertRaises(Exception):
+            KubernetesTransformer(StringIO('kind: Service\n'))
@@ -0,0 +1,104 @@
+import os
+import json
+import shutil
+import tempfile
+from unittest import TestCase
+
+from container_transform.converter import Converter
+from container_transform.manifest import FingerprintManifest
+
+
+class FingerprintManifestTests(TestCase):
+    """
+    Tests for the FingerprintManifest
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'output.manifest')
+        self.manifest = FingerprintManifest(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _task(self, web_image='nginx', source_path='/srv/data'):
+        return {
+            'family': 'app',
+            'containerDefinitions': [
+                {
+                    'name': name,
+                    'image': image,
+                    'memory': 64,
+                    'mountPoints': [{'sourceVolume': 'data', 'containerPath': '/data'}],
+                }
+                for name, image
+                in [('web', web_image), ('db', 'postgres'), ('cache', 'redis')]
+            ],
+            'volumes': [{'name': 'data', 'host': {'sourcePath': source_path}}],
+        }
+
+    def test_fingerprint(self):
+        fingerprint = self.manifest.fingerprint({'name': 'web', 'image': 'nginx'})
+
+        self.assertEqual(fingerprint, self.manifest.fingerprint({'image': 'nginx', 'name': 'web'}))
+        self.assertNotEqual(fingerprint, self.manifest.fingerprint({'name': 'web'}))
+        self.assertNotEqual(
+            fingerprint,
+            self.manifest.fingerprint({'name': 'web', 'image': 'nginx'}, {'volumes_in': {}})
+        )
+
+    def test_load_other_types(self):
+        self.manifest.save('ecs', 'compose', {'abc': {}})
+
+        self.assertEqual(self.manifest.load('ecs', 'compose'), {'abc': {}})
+        self.assertEqual(self.manifest.load('ecs', 'kubernetes'), {})
+        self.assertEqual(FingerprintManifest(self.path + '.missing').load('ecs', 'compose'), {})
+
+    def test_save_failed(self):
+        self.manifest.save('ecs', 'compose', {'abc': {}})
+
+        with self.assertRaises(TypeError):
+            self.manifest.save('ecs', 'compose', {'abc': object()})
+
+        # The temporary file is removed and the manifest is unchanged
+        self.assertEqual(os.listdir(self.directory), ['output.manifest'])
+        self.assertEqual(self.manifest.load('ecs', 'compose'), {'abc': {}})
+
+    def test_convert_changed_services(self):
+        for output_type in ('compose', 'kubernetes', 'systemd'):
+            expected = Converter(self._task(), 'ecs', output_type).convert()
+
+            first = Converter(self._task(), 'ecs', output_type, manifest=self.manifest)
+            self.assertEqual(first.convert(), expected)
+            self.assertEqual(first.stats.containers, 3)
+
+            unchanged = Converter(self._task(), 'ecs', output_type, manifest=self.manifest)
+            self.assertEqual(unchanged.convert(), expected)
+            self.assertEqual(unchanged.stats.containers, 0)
+            self.assertEqual(unchanged.messages, first.messages)
+
+            changed = Converter(
+                self._task(web_image='httpd'), 'ecs', output_type, manifest=self.manifest)
+            self.assertEqual(
+                changed.convert(),
+                Converter(self._task(web_image='httpd'), 'ecs', output_type).convert()
+            )
+            self.assertEqual(changed.stats.containers, 1)
+
+    def test_convert_changed_context(self):
+        Converter(self._task(), 'ecs', 'compose', manifest=self.manifest).convert()
+
+        converter = Converter(
+            self._task(source_path='/srv/other'), 'ecs', 'compose', manifest=self.manifest)
+        output = converter.convert()
+
+        self.assertEqual(converter.stats.containers, 3)
+        self.assertIn('/srv/other:/data', output)
+
+    def test_manifest_pruned(self):
+        Converter(self._task(), 'ecs', 'compose', manifest=self.manifest).convert()
+        Converter(self._task(web_image='httpd'), 'ecs', 'compose', manifest=self.manifest).convert()
+
+        with open(self.path) as stream:
+            services = json.load(stream)['services']
+        self.assertEqual(len(services), 3)
@@ -1,5 +1,8 @@
+import json
+import tempfile
 from unittest import TestCase
 
+from container_transform.converter import Converter
 from container_transform.marathon import MarathonTransformer
 
 
@@ -24,3 +27,49 @@ class MarathonTransformerTests(TestCase):
                 {'uri': 'hdfs://hdfs.marathon.mesos/path/item.json'}
             ]
         )
+
+    def test_validate(self):
+        user = [{'key': 'user', 'value': 'root'}]
+        container = {
+            'id': 'web',
+            'container.docker.image': 'nginx',
+            'container.docker.parameters.user': user,
+            'mem': 64,
+            'container.docker.parameters.workdir': [{'key': 'workdir', 'value': '/srv'}],
+            'container.volumes': [],
+        }
+
+        validated = self.transformer.validate(container)
+
+        self.assertIs(type(validated), dict)
+        self.assertEqual(list(validated)[:3], ['id', 'mem', 'container'])
+        self.assertEqual(list(validated['container']), ['docker', 'volumes', 'type'])
+        self.assertEqual(validated['container']['docker']['parameters'], [
+            {'key': 'user', 'value': 'root'},
+            {'key': 'workdir', 'value': '/srv'},
+        ])
+        self.assertEqual(validated['container']['docker']['network'], 'BRIDGE')
+        self.assertEqual(user, [{'key': 'user', 'value': 'root'}])
+
+    def test_ingest_parameter_without_value(self):
+        app = {
+            'id': 'web',
+            'container': {'docker': {'image': 'nginx', 'parameters': [
+                {'key': 'init'},
+                {'key': 'user', 'value': 'www-data'},
+            ]}},
+        }
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as stream:
+            json.dump(app, stream)
+            stream.flush()
+            output = Converter(stream.name, 'marathon', 'compose').convert()
+
+        self.assertIn('user: www-data', output)
+
+    def test_validate_without_container(self):
+        validated = self.transformer.validate({'id': 'web'})
+
+        self.assertEqual(validated['container'], {
+            'docker': {'network': 'BRIDGE', 'forcePullImage': True},
+            'type': 'DOCKER',
+        })
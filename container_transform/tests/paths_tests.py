@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+from container_transform.paths import DottedPath, ParameterIndex, compile_path, compile_paths
+
+
+class DottedPathTests(TestCase):
+    """
+    Tests for the compiled dotted paths
+    """
+
+    def test_get(self):
+        path = DottedPath('container.docker.image')
+        data = {'container': {'docker': {'image': 'nginx'}}}
+
+        self.assertEqual(path.get(data), 'nginx')
+        self.assertIsNone(path.get({}))
+        self.assertIsNone(path.get({'container': None}))
+        self.assertIsNone(path.get({'container': {'volumes': []}}))
+
+    def test_set(self):
+        data = {'id': 'web'}
+        compile_path('container.docker.image').set(data, 'nginx')
+        compile_path('container.docker.network').set(data, 'HOST')
+        compile_path('container.volumes').set(data, [])
+
+        self.assertEqual(data, {
+            'id': 'web',
+            'container': {'docker': {'image': 'nginx', 'network': 'HOST'}, 'volumes': []},
+        })
+
+    def test_set_extends_lists(self):
+        data = {}
+        path = compile_path('container.docker.parameters')
+        path.set(data, [{'key': 'user', 'value': 'root'}])
+        path.set(data, [{'key': 'workdir', 'value': '/srv'}])
+
+        self.assertEqual(data['container']['docker']['parameters'], [
+            {'key': 'user', 'value': 'root'},
+            {'key': 'workdir', 'value': '/srv'},
+        ])
+
+    def test_parameter(self):
+        path = compile_path('container.docker.parameters.log-driver')
+
+        self.assertEqual(path.parameter, 'log-driver')
+        self.assertIs(path.parameters, compile_path('container.docker.parameters'))
+        self.assertIsNone(compile_path('container.docker.image').parameter)
+
+    def test_compile_paths(self):
+        paths = compile_paths('kubernetes')
+
+        self.assertIs(paths, compile_paths('kubernetes'))
+        self.assertIn((compile_path('resources.limits.cpu'), None), paths)
+        self.assertEqual(compile_paths('compose'), ())
+
+
+class ParameterIndexTests(TestCase):
+    """
+    Tests for the index of a docker parameters list
+    """
+
+    def setUp(self):
+        self.parameters = [
+            {'key': 'log-driver', 'value': 'gelf'},
+            {'key': 'dns', 'value': '8.8.8.8'},
+            {'key': 'log-opt', 'value': 'tag=web'},
+            {'key': 'user', 'value': 'www-data'},
+            {'key': 'dns', 'value': '8.8.4.4'},
+        ]
+        self.index = ParameterIndex(self.parameters)
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup('dns', list), ['8.8.8.8', '8.8.4.4'])
+        self.assertEqual(self.index.lookup('dns'), '8.8.8.8')
+        self.assertEqual(self.index.lookup('user'), 'www-data')
+        self.assertIsNone(self.index.lookup('workdir'))
+        self.assertIsNone(ParameterIndex(None).lookup('user'))
+
+    def test_lookup_without_value(self):
+        index = ParameterIndex([{'key': 'init'}] + self.parameters)
+        self.assertIsNone(index.lookup('init'))
+        self.assertEqual(index.lookup('user'), 'www-data')
+
+    def test_lookup_logging(self):
+        self.assertEqual(
+            self.index.lookup('log-driver'),
+            [self.parameters[0], self.parameters[2]]
+        )
+        self.assertEqual(self.index.lookup('log-opt', list), ['tag=web'])
+        self.assertEqual(ParameterIndex([]).lookup('log-driver'), [])
@@ -0,0 +1,201 @@
+import io
+import os
+import json
+import uuid
+from unittest import TestCase, skipUnless
+
+from mock import patch
+
+from container_transform.converter import Converter
+from container_transform.serialization import (
+    LibYAMLBackend, OrjsonJSONBackend, PyYAMLBackend, StdlibJSONBackend, json_backend,
+    yaml_backend)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    from yaml import __with_libyaml__ as libyaml
+except ImportError:  # pragma: no cover
+    libyaml = False
+
+
+DOCUMENTS = [
+    {},
+    [],
+    {'empty': {}, 'list': [], 'nested': [{'a': [[], {}]}]},
+    {'cpus': 0.25, 'mem': 128, 'small': 1e-05, 'tiny': 3.5e-07, 'large': 1e+16, 'neg': -2.0},
+    [1.5, 2, 100000000000000000000000, -1.2345678901234568e+17, True, False, None],
+    {'image': 'nginx:1.9', 'command': 'sleep 1.5', 'ports': ['8080:80', ' 1.5e3']},
+    {'name': 'café', 'emoji': '\U0001f600', 'del': '\x7f', 'ctrl': '\x00\n\t"\\'},
+    {'b': 1, 'a': {'d': 2, 'c': 3}, 'é': 'key'},
+    {1: 'int key'},
+    0.1,
+    'text',
+]
+
+
+@skipUnless(orjson, 'orjson is not installed')
+class OrjsonJSONBackendTests(TestCase):
+    """
+    Tests that the orjson backend reads and writes the same JSON as the
+    standard library
+    """
+
+    def setUp(self):
+        self.backend = OrjsonJSONBackend()
+        self.stdlib = StdlibJSONBackend()
+
+    def test_dumps(self):
+        for document in DOCUMENTS:
+            for indent in (None, 2, 4, 8):
+                for sort_keys in (True, False):
+                    self.assertEqual(
+                        self.backend.dumps(document, indent, sort_keys),
+                        json.dumps(document, indent=indent, sort_keys=sort_keys),
+                    )
+
+    def test_loads(self):
+        for document in DOCUMENTS:
+            data = json.dumps(document)
+            self.assertEqual(self.backend.loads(data), json.loads(data))
+
+        for data in ['123456789012345678901', '[NaN, Infinity]', '"\\ud800"', '1e400']:
+            self.assertEqual(repr(self.backend.loads(data)), repr(json.loads(data)))
+
+    def test_loads_invalid(self):
+        with self.assertRaises(ValueError):
+            self.backend.loads('{"a": ')
+
+    def test_outputs(self):
+        conversions = [
+            ('composev2_extended.yml', 'compose', 'ecs'),
+            ('composev2_extended.yml', 'compose', 'marathon'),
+            ('marathon-group.json', 'marathon', 'ecs'),
+            ('marathon-group.json', 'marathon', 'marathon'),
+            ('fixtures/chronos.json', 'chronos', 'marathon'),
+        ]
+        for filename, input_type, output_type in conversions:
+            filename = os.path.join(os.path.dirname(__file__), filename)
+            for verbose in (True, False):
+                args = (filename, input_type, output_type, verbose)
+                self.assertEqual(self._convert('orjson', *args), self._convert('json', *args))
+
+    @staticmethod
+    def _convert(name, filename, input_type, output_type, verbose):
+        with patch.dict(os.environ, {'CT_JSON_BACKEND': name}):
+            with patch('uuid.uuid4', return_value=uuid.UUID(int=0)):
+                json_backend.cache_clear()
+                try:
+                    return Converter(filename, input_type, output_type).convert(verbose)
+                finally:
+                    json_backend.cache_clear()
+
+
+class JSONBackendTests(TestCase):
+
+    def tearDown(self):
+        json_backend.cache_clear()
+
+    def test_json_backend_environment(self):
+        with patch.dict(os.environ, {'CT_JSON_BACKEND': 'json'}):
+            json_backend.cache_clear()
+            self.assertIsInstance(json_backend(), StdlibJSONBackend)
+            self.assertNotIsInstance(json_backend(), OrjsonJSONBackend)
+
+    @skipUnless(orjson, 'orjson is not installed')
+    def test_json_backend_orjson(self):
+        with patch.dict(os.environ, {'CT_JSON_BACKEND': 'orjson'}):
+            json_backend.cache_clear()
+            self.assertIsInstance(json_backend(), OrjsonJSONBackend)
+
+    def test_json_backend_default(self):
+        with patch.dict(os.environ, {'CT_JSON_BACKEND': ''}):
+            json_backend.cache_clear()
+            self.assertEqual(json_backend().name, 'json')
+
+
+YAML_DOCUMENTS = DOCUMENTS + [
+    {'command': 'sh -c "echo {} && sleep 1.5"'.format('word ' * 40), 'yes': 'no'},
+    {'environment': {'KEY': 'a \'quoted\' # value: ' * 10, 'EMPTY': ''}},
+    {'script': 'set -e\n' * 20, 'tab': 'a\tb ' * 30, 'unicode': 'caf\xe9 ' * 30},
+    {'': 'empty key', 'k' * 120: 'long key', 'ok' * 50: [{'a': 'b'}] * 3},
+    {'nested': {'level': {'level': {'level': {'level': 'deep ' * 40}}}}},
+]
+
+
+@skipUnless(libyaml, 'PyYAML was built without libyaml')
+class LibYAMLBackendTests(TestCase):
+    """
+    Tests that the libyaml backend reads and writes the same YAML as the pure
+    Python parser and emitter
+    """
+
+    def setUp(self):
+        self.backend = LibYAMLBackend()
+        self.python = PyYAMLBackend()
+
+    def test_dump(self):
+        for document in YAML_DOCUMENTS:
+            self.assertEqual(self.backend.dump(document), self.python.dump(document))
+
+        stream = io.StringIO()
+        self.assertIsNone(self.backend.dump(YAML_DOCUMENTS[-1], stream))
+        self.assertEqual(stream.getvalue(), self.python.dump(YAML_DOCUMENTS[-1]))
+
+    def test_load(self):
+        for document in YAML_DOCUMENTS:
+            data = self.python.dump(document)
+            self.assertEqual(self.backend.load(data), self.python.load(data))
+
+        for filename in ('docker-compose.yml', 'composev2_extended.yml', 'k8s_tests/dns.yaml'):
+            with open(os.path.join(os.path.dirname(__file__), filename)) as stream:
+                data = stream.read()
+            self.assertEqual(list(self.backend.load_all(data)), list(self.python.load_all(data)))
+
+    def test_outputs(self):
+        conversions = [
+            ('docker-compose.yml', 'compose', 'compose'),
+            ('composev2_extended.yml', 'compose', 'kubernetes'),
+            ('k8s_tests/dns.yaml', 'kubernetes', 'compose'),
+            ('k8s_tests/kubernetes-dashboard.yaml', 'kubernetes', 'kubernetes'),
+            ('marathon-group.json', 'marathon', 'kubernetes'),
+        ]
+        for filename, input_type, output_type in conversions:
+            filename = os.path.join(os.path.dirname(__file__), filename)
+            for verbose in (True, False):
+                args = (filename, input_type, output_type, verbose)
+                self.assertEqual(self._convert('libyaml', *args), self._convert('yaml', *args))
+
+    @staticmethod
+    def _convert(name, filename, input_type, output_type, verbose):
+        with patch.dict(os.environ, {'CT_YAML_BACKEND': name}):
+            yaml_backend.cache_clear()
+            try:
+                return Converter(filename, input_type, output_type).convert(verbose)
+            finally:
+                yaml_backend.cache_clear()
+
+
+class YAMLBackendTests(TestCase):
+
+    def tearDown(self):
+        yaml_backend.cache_clear()
+
+    def test_yaml_backend_environment(self):
+        with patch.dict(os.environ, {'CT_YAML_BACKEND': 'yaml'}):
+            yaml_backend.cache_clear()
+            self.assertIsInstance(yaml_backend(), PyYAMLBackend)
+            self.assertNotIsInstance(yaml_backend(), LibYAMLBackend)
+
+    def test_yaml_backend_fallback(self):
+        with patch.dict(os.environ, {'CT_YAML_BACKEND': ''}):
+            with patch('yaml.__with_libyaml__', False):
+                yaml_backend.cache_clear()
+                self.assertEqual(yaml_backend().name, 'yaml')
+
+    def test_dump_without_aliases(self):
+        value = {'a': 'b'}
+        self.assertEqual(PyYAMLBackend().dump([value, value]), '- a: b\n- a: b\n')
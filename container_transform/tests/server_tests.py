@@ -0,0 +1,111 @@
+import os
+import json
+import shutil
+import socket
+import tempfile
+import threading
+from http.client import HTTPConnection
+from unittest import TestCase
+
+from container_transform.converter import Converter
+from container_transform.server import make_server
+
+
+class UnixHTTPConnection(HTTPConnection):
+
+    def __init__(self, socket_path):
+        super(UnixHTTPConnection, self).__init__('localhost')
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+class ServerTests(TestCase):
+    """
+    Tests for the conversion server
+    """
+
+    def setUp(self):
+        self.filename = './container_transform/tests/composev2.yml'
+        self.document = open(self.filename).read()
+
+    def _start(self, server):
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+    def _post(self, connection, body):
+        connection.request('POST', '/', json.dumps(body))
+        response = connection.getresponse()
+        return response.status, json.loads(response.read().decode('utf-8'))
+
+    def test_convert_tcp(self):
+        server = make_server(port=0)
+        self._start(server)
+
+        connection = HTTPConnection(*server.server_address)
+        for _ in range(2):
+            status, body = self._post(connection, {
+                'input_type': 'compose',
+                'output_type': 'ecs',
+                'document': self.document,
+            })
+            self.assertEqual(status, 200)
+            converter = Converter(self.filename, 'compose', 'ecs')
+            self.assertEqual(body['output'], converter.convert())
+            self.assertEqual(body['messages'], sorted(converter.messages))
+            self.assertIn('elapsed_ms', body)
+        connection.close()
+
+    def test_convert_unix_socket(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        socket_path = os.path.join(directory, 'ct.sock')
+
+        server = make_server(socket_path=socket_path)
+        self._start(server)
+
+        connection = UnixHTTPConnection(socket_path)
+        status, body = self._post(connection, {
+            'input_type': 'compose',
+            'output_type': 'systemd',
+            'document': self.document,
+        })
+        connection.close()
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body['output'], Converter(self.filename, 'compose', 'systemd').convert())
+
+    def test_bad_requests(self):
+        server = make_server(port=0)
+        self._start(server)
+
+        connection = HTTPConnection(*server.server_address)
+        for request, status, error in [
+                ('not json', 400, 'Invalid JSON request'),
+                ({'input_type': 'compose', 'output_type': 'ecs'}, 400, 'must contain'),
+                ({'input_type': 'x', 'output_type': 'ecs', 'document': ''}, 400, 'input_type'),
+                ({'input_type': 'ecs', 'output_type': 'x', 'document': ''}, 400, 'output_type'),
+                ({'input_type': 'ecs', 'output_type': 'compose', 'document': '{'}, 422, 'Error'),
+        ]:
+            body = request if isinstance(request, str) else json.dumps(request)
+            connection.request('POST', '/', body)
+            response = connection.getresponse()
+            self.assertEqual(response.status, status)
+            self.assertIn(error, json.loads(response.read().decode('utf-8'))['error'])
+        connection.close()
+
+        for length in ('abc', '-1'):
+            connection = HTTPConnection(*server.server_address)
+            connection.putrequest('POST', '/')
+            connection.putheader('Content-Length', length)
+            connection.endheaders()
+            response = connection.getresponse()
+            self.assertEqual(response.status, 400)
+            self.assertIn(
+                'Content-Length', json.loads(response.read().decode('utf-8'))['error'])
+            connection.close()
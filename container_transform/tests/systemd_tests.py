@@ -1,8 +1,11 @@
 import os
+import tempfile
 from unittest import TestCase
 
+from mock import patch
 
-from container_transform.systemd import SystemdTransformer
+from container_transform.systemd import (
+    ENVIRONMENT, UNIT_TEMPLATE_NAME, SystemdTransformer, _bytecode_cache)
 
 
 class SystemdTransformerTests(TestCase):
@@ -54,6 +57,96 @@ class SystemdTransformerTests(TestCase):
             service_contents
         )
 
+    def test_emit_containers_compiles_once(self):
+        containers = [
+            {'name': 'web', 'image': 'nginx', 'links': ['db:database']},
+            {'name': 'db', 'image': 'postgres'},
+        ]
+        ENVIRONMENT.cache.clear()
+        with patch.object(ENVIRONMENT, 'compile', wraps=ENVIRONMENT.compile) as compile_mock:
+            output = self.transformer.emit_containers(containers)
+            self.assertEqual(self.transformer.emit_containers(containers), output)
+        self.assertEqual(compile_mock.call_count, 1)
+
+        self.assertIn('After=docker.service db.service', output)
+        # The containers aren't changed by rendering
+        self.assertNotIn('link_keys', containers[0])
+
+    def test_bytecode_cache(self):
+        with patch.dict(os.environ, {'CT_TEMPLATE_CACHE_DIR': ''}):
+            self.assertIsNone(_bytecode_cache())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            directory = os.path.join(temp_dir, 'templates')
+            with patch.dict(os.environ, {'CT_TEMPLATE_CACHE_DIR': directory}):
+                cache = _bytecode_cache()
+            self.assertFalse(os.path.exists(directory))
+
+            environment = ENVIRONMENT.overlay(bytecode_cache=cache, cache_size=0)
+            environment.get_template(UNIT_TEMPLATE_NAME)
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+            with patch.object(environment, 'compile') as compile_mock:
+                template = environment.get_template(UNIT_TEMPLATE_NAME)
+            compile_mock.assert_not_called()
+            self.assertIn('[Unit]', template.render(name='web'))
+
+    def test_bytecode_cache_unwritable(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # A file where the directory should be
+            directory = os.path.join(temp_dir, 'templates')
+            open(directory, 'w').close()
+            with patch.dict(os.environ, {'CT_TEMPLATE_CACHE_DIR': directory}):
+                cache = _bytecode_cache()
+
+            environment = ENVIRONMENT.overlay(bytecode_cache=cache, cache_size=0)
+            template = environment.get_template(UNIT_TEMPLATE_NAME)
+            self.assertIn('[Unit]', template.render(name='web'))
+
+    def test_write_units(self):
+        containers = [
+            {'name': 'web', 'image': 'nginx', 'links': ['db']},
+            {'name': 'db', 'image': 'postgres'},
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            web = os.path.join(directory, 'web.service')
+            db = os.path.join(directory, 'db.service')
+
+            written = self.transformer.write_units(containers, directory)
+            self.assertEqual(written, {web: True, db: True})
+            self.assertEqual(
+                open(web).read() + '\n' + open(db).read(),
+                self.transformer.emit_containers(containers)
+            )
+            self.assertEqual(os.stat(web).st_mode & 0o777, 0o644)
+
+            # Only changed units are replaced
+            os.utime(db, (0, 0))
+            containers[0]['image'] = 'httpd'
+            written = self.transformer.write_units(containers, directory, workers=4)
+            self.assertEqual(written, {web: True, db: False})
+            self.assertIn('docker pull httpd', open(web).read())
+            self.assertEqual(os.stat(db).st_mtime, 0)
+            self.assertEqual(sorted(os.listdir(directory)), ['db.service', 'web.service'])
+
+            # Only the last container of a name is written
+            containers.append({'name': 'web', 'image': 'caddy'})
+            self.transformer.write_units(containers, directory, workers=4)
+            self.assertIn('docker pull caddy', open(web).read())
+
+            for name in (None, '', '../web', '..'):
+                with self.assertRaises(ValueError):
+                    self.transformer.write_units([{'name': name}], directory)
+
+    def test_write_units_failed(self):
+        containers = [{'name': 'web', 'image': 'nginx'}]
+        with tempfile.TemporaryDirectory() as directory:
+            with patch('os.replace', side_effect=OSError('No space left on device')):
+                with self.assertRaises(OSError):
+                    self.transformer.write_units(containers, directory)
+            # The temporary file is removed
+            self.assertEqual(os.listdir(directory), [])
+
     def test_ingest_methods(self):
         """
         Test that "ingest_*" methods return nothing
@@ -0,0 +1,71 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+from container_transform.watch import FileWatcher
+
+
+class FileWatcherTests(TestCase):
+    """
+    Tests for the FileWatcher
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'docker-compose.yml')
+        self._write(b'a')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, data):
+        with open(self.path, 'wb') as stream:
+            stream.write(data)
+
+    def _replace(self, data):
+        tmp_path = os.path.join(self.directory, 'docker-compose.yml.swp')
+        with open(tmp_path, 'wb') as stream:
+            stream.write(data)
+        os.replace(tmp_path, self.path)
+
+    def _edit(self):
+        time.sleep(0.1)
+        # Saving the same content is not a change
+        self._write(b'a')
+        time.sleep(0.1)
+        # A burst of writes is one change
+        for data in (b'b', b'c', b'd'):
+            self._write(data)
+        time.sleep(0.2)
+        # Editors often save by replacing the file
+        self._replace(b'e')
+
+    def _changes(self, use_inotify):
+        watcher = FileWatcher(self.path, interval=0.02, debounce=0.05, use_inotify=use_inotify)
+        thread = threading.Thread(target=self._edit)
+        thread.start()
+
+        changes = []
+        generator = watcher.changes()
+        for data in generator:
+            changes.append(data)
+            if data == b'e':
+                break
+        generator.close()
+        thread.join()
+        return watcher, changes
+
+    def test_polling(self):
+        watcher, changes = self._changes(use_inotify=False)
+
+        self.assertFalse(watcher.uses_inotify)
+        self.assertEqual(changes, [b'a', b'd', b'e'])
+
+    def test_inotify(self):
+        watcher, changes = self._changes(use_inotify=True)
+
+        self.assertEqual(changes, [b'a', b'd', b'e'])
+        self.assertIsNone(watcher._fd)
@@ -1,6 +1,173 @@
 import shlex
 from abc import ABCMeta, abstractmethod
 
+
+class Record(object):
+    """
+    A compact value of the base schema, with one slot per field. Fields that
+    aren't set are ``None``, and are treated as missing, so a record can
+    also be read like the dict it replaces with ``.get()``, ``[]`` and
+    ``in``, and compares equal to that dict.
+    """
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for field in self.__slots__:
+            setattr(self, field, fields.pop(field, None))
+        if fields:
+            raise TypeError('{} has no fields {}'.format(
+                type(self).__name__, ', '.join(sorted(fields))))
+
+    @classmethod
+    def from_value(cls, value):
+        """
+        :param value: A record, or a dict with the record's fields
+        :type value: Record or dict
+
+        :rtype: Record
+        """
+        if isinstance(value, cls):
+            return value
+        return cls(**value)
+
+    def _value(self, field):
+        return getattr(self, field) if field in self.__slots__ else None
+
+    def get(self, field, default=None):
+        value = self._value(field)
+        return default if value is None else value
+
+    def __getitem__(self, field):
+        value = self._value(field)
+        if value is None:
+            raise KeyError(field)
+        return value
+
+    def __contains__(self, field):
+        return self._value(field) is not None
+
+    def as_dict(self):
+        """
+        :returns: The fields that are set
+        :rtype: dict
+        """
+        return dict(
+            (field, getattr(self, field))
+            for field
+            in self.__slots__
+            if getattr(self, field) is not None
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.as_dict() == other.as_dict()
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(field, value)
+            for field, value
+            in self.as_dict().items()
+        ))
+
+
+class PortMapping(Record):
+    __slots__ = (
+        'host_ip',
+        'host_port',  # 0 is a valid, non-false value
+        'container_ip',
+        'container_port',
+        'protocol',  # 'tcp' or 'udp'
+        'name',
+    )
+
+
+class Volume(Record):
+    __slots__ = ('host', 'container', 'readonly')
+
+
+class Logging(Record):
+    __slots__ = (
+        'driver',
+        'options',  # See compose options
+        'extra',  # Any other keys, such as ECS secretOptions, as they were
+    )
+    fields = ('driver', 'options')
+
+    @classmethod
+    def from_value(cls, value):
+        """
+        :param value: A record, or a logging dict. Keys other than ``driver``
+            and ``options`` are kept in ``extra``.
+        :type value: Logging or dict
+
+        :rtype: Logging
+        """
+        if isinstance(value, cls):
+            return value
+        extra = dict(value)
+        fields = dict((field, extra.pop(field, None)) for field in cls.fields)
+        return cls(extra=extra or None, **fields)
+
+    def _value(self, field):
+        if field in self.fields:
+            return getattr(self, field)
+        return (self.extra or {}).get(field)
+
+    def as_dict(self):
+        """
+        :returns: The fields that are set, along with the ``extra`` keys
+        :rtype: dict
+        """
+        data = dict(self.extra or {})
+        data.update(
+            (field, getattr(self, field))
+            for field
+            in self.fields
+            if getattr(self, field) is not None
+        )
+        return data
+
+
+class Container(Record):
+    """
+    The base schema values of a container, as produced by the
+    ``.ingest_*()`` methods
+    """
+    __slots__ = (
+        'image',
+        'name',
+        'cpu',
+        'memory',
+        'links',
+        'port_mappings',
+        'environment',
+        'entrypoint',
+        'command',
+        'essential',
+        'volumes_from',
+        'volumes',
+        'dns',
+        'work_dir',
+        'domain',
+        'build',
+        'expose',
+        'network',
+        'net_mode',
+        'privileged',
+        'labels',
+        'logging',
+        'user',
+        'env_file',
+        'pid',
+        'fetch',
+    )
+
+
 """The SCHEMA defines the argument format the .ingest_*() and .emit_*()
 methods should produce and accept (respectively)"""
 SCHEMA = {
@@ -9,22 +176,13 @@ SCHEMA = {
     'cpu': int,  # out of 1024
     'memory': int,  # in bytes
     'links': list,  # This is universal across formats
-    'logging': {
-        # See compose options
-    },
-    'port_mappings': [{
-        'host_ip': str,
-        'host_port': int,  # 0 is a valid, non-false value
-        'container_ip': str,
-        'container_port': int,
-        'protocol': 'tcp' or 'udp',
-        'name': str,
-    }],
+    'logging': Logging,
+    'port_mappings': [PortMapping],
     'environment': dict,  # A simple key: value dictionary
     'entrypoint': str,  # An unsplit string
     'command': str,  # An unsplit string
     'volumes_from': list,  # A list of containers
-    'volumes': list,  # A list of dict {'host': '/path', 'container': '/path', 'readonly': True}
+    'volumes': [Volume],
     'dns': list,
     'domain': list,
     'labels': dict,
@@ -47,6 +205,13 @@ class BaseTransformer(object, metaclass=ABCMeta):
         normalized_keys = transformer.ingest_containers()
 
     """
+    # Attributes of the input, besides each container, that ingesting a
+    # container depends on
+    context_attributes = ()
+    # Attributes holding state collected while emitting containers, which
+    # ``merge()`` reads from another instance
+    state_attributes = ()
+
     @staticmethod
     def _list2cmdline(commands):
         def quote(cmd):
@@ -65,9 +230,14 @@ class BaseTransformer(object, metaclass=ABCMeta):
 
     def _read_file(self, filename):
         """
-        :param filename: The location of the file to read
-        :type filename: str
+        :param filename: The location of the file to read, an already open
+            file-like object, or already parsed data
+        :type filename: str or file or dict or list
         """
+        if isinstance(filename, (dict, list)):
+            return self._read_data(filename)
+        if hasattr(filename, 'read'):
+            return self._read_stream(stream=filename)
         with open(filename, 'r') as stream:
             return self._read_stream(stream=stream)
 
@@ -75,13 +245,23 @@ class BaseTransformer(object, metaclass=ABCMeta):
     def _read_stream(self, stream):
         """
         Override this method and parse the stream to be passed to
-        ``self.transform()``
+        ``self._read_data()``
 
         :param stream: A file-like object
         :type stream: file
         """
         raise NotImplementedError
 
+    def _read_data(self, data):
+        """
+        Override this method to pull the containers and any other needed
+        information out of the parsed input
+
+        :param data: The parsed input
+        :type data: dict or list
+        """
+        return data
+
     @abstractmethod
     def ingest_containers(self, containers=None):
         """
@@ -97,10 +277,108 @@ class BaseTransformer(object, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    def iter_containers(self, containers=None):
+        """
+        Yield the same container definitions as ``.ingest_containers()``,
+        normalizing each one only when it is needed. Transformers override
+        this to avoid building the whole list.
+
+        :rtype: iterator of dict
+        """
+        return iter(self.ingest_containers(containers))
+
     @abstractmethod
     def emit_containers(self, containers, verbose=True):
         raise NotImplementedError
 
+    def write_containers(self, containers, stream, verbose=True):
+        """
+        Write the same output as ``.emit_containers()`` to ``stream``,
+        consuming ``containers`` as they are produced. By default the whole
+        output is built first, transformers override this to buffer only what
+        the format needs, such as the containers it sorts.
+
+        :param containers: The validated container definitions
+        :type containers: iterable of dict
+        :param stream: A writable file-like object
+        :type stream: file
+        :param verbose: Print out newlines and indented output
+        :type verbose: bool
+        """
+        stream.write(self.emit_containers(list(containers), verbose))
+
+    def merge(self, other):
+        """
+        Merge any state another instance collected while emitting containers
+        into this one, such as when containers are converted in parallel
+        chunks. Transformers without state don't need to override this.
+
+        :param other: Another instance of the same transformer
+        :type other: BaseTransformer
+        """
+        pass
+
+    def emit_document(self, containers):
+        """
+        Build the output document from the container definitions, without
+        serializing it. ``.emit_containers()`` serializes this document.
+
+        :param containers: The validated container definitions
+        :type containers: list of dict
+
+        :rtype: dict or list
+        """
+        raise NotImplementedError(
+            '{} does not support document output'.format(self.__class__.__name__))
+
+    def stream_containers(self, containers, stream):
+        """
+        Write each container to ``stream`` as it is produced, one compact JSON
+        object per line. Only JSON output formats override this.
+
+        :param containers: The validated container definitions
+        :type containers: iterable of dict
+        :param stream: A writable file-like object
+        :type stream: file
+        """
+        raise NotImplementedError(
+            '{} does not support streaming output'.format(self.__class__.__name__))
+
+    def write_units(self, containers, directory, workers=None):
+        """
+        Write each container to its own file in ``directory``. Only output
+        formats with one file per container, such as systemd units, override
+        this.
+
+        :param containers: The validated container definitions
+        :type containers: iterable of dict
+        :param directory: The directory to write the files to
+        :type directory: str
+        :param workers: The number of threads to write files with
+        :type workers: int
+
+        :rtype: dict
+        :returns: Whether each file was written, keyed by its path
+        """
+        raise NotImplementedError(
+            '{} does not support writing units'.format(self.__class__.__name__))
+
+    @classmethod
+    def iter_workloads(cls, source):
+        """
+        Yield each workload of an input with several, such as the
+        Deployments of a bundle of Kubernetes manifests, as it is read. Only
+        input formats with several workloads per input override this.
+
+        :param source: The file to be loaded, an open file-like object, or
+            the already parsed input
+        :type source: str or file or dict or list
+
+        :rtype: generator of dict
+        """
+        raise NotImplementedError(
+            '{} does not support several workloads'.format(cls.__name__))
+
     @staticmethod
     @abstractmethod
     def validate(container):
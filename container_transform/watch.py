@@ -0,0 +1,165 @@
+import os
+import time
+import ctypes
+import select
+import hashlib
+import ctypes.util
+
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0)
+
+
+def _inotify_watch(directory):
+    """
+    Watch a directory for written, created and renamed files with inotify
+
+    :returns: A non-blocking inotify file descriptor, or ``None`` where
+        inotify isn't available
+    :rtype: int
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        inotify_init1 = libc.inotify_init1
+        inotify_add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError, TypeError):
+        return None
+
+    fd = inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        return None
+
+    mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    if inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class FileWatcher(object):
+    """
+    Waits for the content of a file to change.
+
+    Changes are noticed with inotify where it is available, or by polling the
+    file's modification time and size. Bursts of changes, such as an editor
+    saving a file, are debounced into one, and a change is only reported when
+    the content is different from the last time.
+
+    To use this class:
+
+    .. code-block:: python
+
+        for data in FileWatcher('./docker-compose.yml').changes():
+            print(Converter(io.StringIO(data.decode('utf-8')), 'compose', 'ecs').convert())
+
+    """
+
+    def __init__(self, path, interval=0.5, debounce=0.1, use_inotify=True):
+        """
+        :param path: The file to watch
+        :type path: str
+        :param interval: How often to poll the file in seconds, when not
+            using inotify
+        :type interval: float
+        :param debounce: How long the file must be left unchanged in seconds
+            before it is read
+        :type debounce: float
+        :param use_inotify: Use inotify where it is available
+        :type use_inotify: bool
+        """
+        self.path = path
+        self.interval = interval
+        self.debounce = debounce
+
+        self._fd = None
+        if use_inotify:
+            self._fd = _inotify_watch(os.path.dirname(os.path.abspath(path)))
+        self._signature = None
+        self._digest = None
+
+    @property
+    def uses_inotify(self):
+        """
+        :rtype: bool
+        """
+        return self._fd is not None
+
+    def changes(self):
+        """
+        Yield the content of the file now, then each time it changes
+
+        :rtype: generator of bytes
+        """
+        self._signature = self._stat()
+        try:
+            while True:
+                data = self._read()
+                if data is not None:
+                    digest = hashlib.sha256(data).digest()
+                    if digest != self._digest:
+                        self._digest = digest
+                        yield data
+
+                self._wait(None)
+                while self._wait(self.debounce):
+                    pass
+        finally:
+            self.close()
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read(self):
+        try:
+            with open(self.path, 'rb') as stream:
+                return stream.read()
+        except OSError:
+            # The file is missing while an editor replaces it
+            return None
+
+    def _wait(self, timeout):
+        """
+        Wait for the file to possibly change
+
+        :param timeout: Seconds to wait, or ``None`` to wait until a change
+        :type timeout: float
+
+        :returns: Whether there was a change before the timeout
+        :rtype: bool
+        """
+        if self._fd is not None:
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+            if not readable:
+                return False
+            self._drain()
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+            signature = self._stat()
+            if signature != self._signature:
+                self._signature = signature
+                return True
+        return False
+
+    def _drain(self):
+        while True:
+            try:
+                if not os.read(self._fd, 4096):
+                    return
+            except BlockingIOError:
+                return
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -60,6 +60,7 @@ setup(
     entry_points='''
         [console_scripts]
         container-transform=container_transform.client:transform
+        container-transform-serve=container_transform.client:serve
     ''',
     license='MIT',
     install_requires=install_requires,